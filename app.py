@@ -7,6 +7,8 @@ from tkinter import ttk, filedialog, messagebox
 from tkcalendar import Calendar
 import pandas as pd
 from dataLoaderClass import DataLoader
+from priceCacheClass import PriceCache
+from taskSchedulerClass import TaskScheduler
 from statisticalAnalysisClass import DataAnalyzer
 from visualizationClass import DataVisualizer
 
@@ -25,13 +27,15 @@ class App:
         style.configure("TLabelFrame", background="#f0f0f0", font=("Helvetica", 12, "bold"))
         style.configure("TLabel", background="#f0f0f0", font=("Helvetica", 10))
 
-        self.data_loader = DataLoader()
+        self.data_loader = DataLoader(cache=PriceCache())
         self.data_analyzer = DataAnalyzer()
         self.data_visualizer = DataVisualizer()
         self.data = None
         self.ticker = None
+        self.scheduler = TaskScheduler(self.root, on_change=self.update_status)
 
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
 
     def create_widgets(self):
 
@@ -116,6 +120,18 @@ class App:
 
         self.macd_button = ttk.Button(self.plot_frame, text="Plot MACD", command=self.plot_macd)
         self.macd_button.pack(side="left", padx=10, pady=5)
+#STATUS
+        status_frame = ttk.Frame(self.root, padding=(20, 10))
+        status_frame.pack(fill="x", padx=20, pady=10)
+
+        self.progress_bar = ttk.Progressbar(status_frame, mode="indeterminate", length=200)
+        self.progress_bar.pack(side="left", padx=10, pady=5)
+
+        self.status_label = ttk.Label(status_frame, text="Ready")
+        self.status_label.pack(side="left", padx=10, pady=5)
+
+        self.cancel_button = ttk.Button(status_frame, text="Cancel", command=self.scheduler.cancel)
+        self.cancel_button.pack(side="left", padx=10, pady=5)
 
     def pick_date(self, entry):
         def print_sel():
@@ -129,67 +145,115 @@ class App:
 
         ttk.Button(top, text="Select", command=print_sel).pack(pady=20)
 
+    def update_status(self, pending):
+        if pending:
+            self.progress_bar.start(10)
+            self.status_label.config(text=f"Running {pending} task(s)...")
+        else:
+            self.progress_bar.stop()
+            self.status_label.config(text="Ready")
+
+    def close(self):
+        self.scheduler.shutdown()
+        self.root.destroy()
+
+    def show_error(self, error):
+        messagebox.showerror("Error", f"An error occurred: {error}")
+
+    def set_data(self, data, ticker, message):
+        if data is not None:
+            self.data = data
+            self.ticker = ticker
+            messagebox.showinfo("Information", message)
+
     def load_csv(self):
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
-            self.data = self.data_loader.load_csv(file_path)
-            self.ticker = file_path.split('/')[-1].split('.')[0]
-            messagebox.showinfo("Information", "Data loaded successfully")
+            ticker = file_path.split('/')[-1].split('.')[0]
+            self.scheduler.submit(('load_csv', file_path), lambda: self.data_loader.load_csv(file_path),
+                                  lambda data: self.set_data(data, ticker, "Data loaded successfully"), self.show_error)
 
     def load_yfinance(self):
         ticker = self.stock_combobox.get()
         if ticker == "Select Stock":
             messagebox.showwarning("Warning", "Please select a stock.")
             return
-        self.ticker = ticker
         start_date = self.start_date_entry.get()
         end_date = self.end_date_entry.get()
-        self.data = self.data_loader.load_yfinance(ticker, start_date, end_date)
-        if self.data is not None:
-            messagebox.showinfo("Information", "YFinance data loaded successfully")
+        self.scheduler.submit(('load_yfinance', ticker, start_date, end_date),
+                              lambda: self.data_loader.load_yfinance(ticker, start_date, end_date),
+                              lambda data: self.set_data(data, ticker, "YFinance data loaded successfully"),
+                              self.show_error)
+
+    def run_analysis(self, name, function, title, message, inputs=()):
+        # Snapshot the current data so a load finishing mid-task can't mix inputs.
+        # Anything else the result depends on goes into inputs, so requests
+        # that differ only there are not coalesced.
+        if self.data is not None and self.ticker is not None:
+            data, ticker = self.data, self.ticker
 
-    def calculate_mean(self):
+            def show(value):
+                if value is not None:
+                    messagebox.showinfo(title, message.format(ticker=ticker, value=value))
+
+            self.scheduler.submit((name, ticker, id(data)) + tuple(inputs), lambda: function(data), show,
+                                  self.show_error)
+
+    def run_plot(self, name, prepare, plot):
+        # Indicators are computed off the Tk thread into the visualizer's
+        # cache; the drawing itself has to happen back on the Tk thread.
         if self.data is not None and self.ticker is not None:
-            mean_value = self.data_analyzer.calculate_mean(self.data, 'Close')
-            messagebox.showinfo("Mean Value", f"The mean Close price for {self.ticker} is: {mean_value}")
+            data, ticker = self.data, self.ticker
+            self.scheduler.submit((name, ticker, id(data)), lambda: prepare(data),
+                                  lambda _: plot(data, ticker), self.show_error)
+
+    def calculate_mean(self):
+        self.run_analysis('mean', lambda data: self.data_analyzer.calculate_mean(data, 'Close'),
+                          "Mean Value", "The mean Close price for {ticker} is: {value}")
 
     def calculate_cagr(self):
-        if self.data is not None and self.ticker is not None:
-            cagr_value = self.data_analyzer.calculate_cagr(self.data, 'Close', 252)
-            messagebox.showinfo("CAGR Value", f"The CAGR for {self.ticker} is: {cagr_value}")
+        self.run_analysis('cagr', lambda data: self.data_analyzer.calculate_cagr(data, 'Close', 252),
+                          "CAGR Value", "The CAGR for {ticker} is: {value}")
 
     def calculate_std(self):
-        if self.data is not None and self.ticker is not None:
-            std_value = self.data_analyzer.calculate_std(self.data, 'Close')
-            messagebox.showinfo("Standard Deviation", f"The standard deviation of Close price for {self.ticker} is: {std_value}")
+        self.run_analysis('std', lambda data: self.data_analyzer.calculate_std(data, 'Close'),
+                          "Standard Deviation", "The standard deviation of Close price for {ticker} is: {value}")
+
     def calculate_variance(self):
-        if self.data is not None and self.ticker is not None:
-            variance_value = self.data_analyzer.calculate_variance(self.data, 'Close')
-            messagebox.showinfo("Variance", f"The variance of Close price for {self.ticker} is: {variance_value}")
+        self.run_analysis('variance', lambda data: self.data_analyzer.calculate_variance(data, 'Close'),
+                          "Variance", "The variance of Close price for {ticker} is: {value}")
 
     def calculate_sharpe_ratio(self):
-        if self.data is not None and self.ticker is not None:
-            sharpe_value = self.data_analyzer.calculate_sharpe_ratio(self.data, 'Close')
-            messagebox.showinfo("Sharpe Ratio", f"The Sharpe Ratio for {self.ticker} is: {sharpe_value}")
+        self.run_analysis('sharpe', lambda data: self.data_analyzer.calculate_sharpe_ratio(data, 'Close'),
+                          "Sharpe Ratio", "The Sharpe Ratio for {ticker} is: {value}")
 
     def calculate_beta(self):
-        if self.data is not None and self.ticker is not None:
-            market_data = self.load_market_data()
+        start_date = self.start_date_entry.get()
+        end_date = self.end_date_entry.get()
+
+        def beta(data):
+            market_data = self.load_market_data(start_date, end_date)
             if market_data is not None:
-                beta_value = self.data_analyzer.calculate_beta(self.data, market_data, 'Close')
-                messagebox.showinfo("Beta Value", f"The Beta Value for {self.ticker} is: {beta_value}")
+                return self.data_analyzer.calculate_beta(data, market_data, 'Close')
+
+        self.run_analysis('beta', beta, "Beta Value", "The Beta Value for {ticker} is: {value}",
+                          inputs=(start_date, end_date))
 
     def calculate_alpha(self):
-        if self.data is not None and self.ticker is not None:
-            market_data = self.load_market_data()
+        start_date = self.start_date_entry.get()
+        end_date = self.end_date_entry.get()
+
+        def alpha(data):
+            market_data = self.load_market_data(start_date, end_date)
             if market_data is not None:
-                alpha_value = self.data_analyzer.calculate_alpha(self.data, market_data, 'Close')
-                messagebox.showinfo("Alpha Value", f"The Alpha Value for {self.ticker} is: {alpha_value}")
+                return self.data_analyzer.calculate_alpha(data, market_data, 'Close')
+
+        self.run_analysis('alpha', alpha, "Alpha Value", "The Alpha Value for {ticker} is: {value}",
+                          inputs=(start_date, end_date))
 
     def calculate_max_drawdown(self):
-        if self.data is not None and self.ticker is not None:
-            mdd_value = self.data_analyzer.calculate_max_drawdown(self.data, 'Close')
-            messagebox.showinfo("Max Drawdown", f"The Maximum Drawdown for {self.ticker} is: {mdd_value}")
+        self.run_analysis('max_drawdown', lambda data: self.data_analyzer.calculate_max_drawdown(data, 'Close'),
+                          "Max Drawdown", "The Maximum Drawdown for {ticker} is: {value}")
 
     def plot_price_series(self):
         if self.data is not None and self.ticker is not None:
@@ -200,29 +264,27 @@ class App:
             self.data_visualizer.plot_volume(self.data, self.ticker)
 
     def plot_rsi(self):
-        if self.data is not None and self.ticker is not None:
-            self.data_visualizer.plot_rsi(self.data, self.ticker)
+        self.run_plot('rsi', lambda data: self.data_visualizer.indicator_engine.rsi(data['Close'], 14),
+                      lambda data, ticker: self.data_visualizer.plot_rsi(data, ticker))
 
     def plot_moving_average(self):
-        if self.data is not None and self.ticker is not None:
-            self.data_visualizer.plot_moving_average(self.data, 'Close', window=20, ticker=self.ticker)
+        self.run_plot('moving_average', lambda data: self.data_visualizer.indicator_engine.sma(data['Close'], 20),
+                      lambda data, ticker: self.data_visualizer.plot_moving_average(data, 'Close', window=20, ticker=ticker))
 
     def plot_candlestick(self):
         if self.data is not None and self.ticker is not None:
             self.data_visualizer.plot_candlestick(self.data, self.ticker)
 
     def plot_bollinger_bands(self):
-        if self.data is not None and self.ticker is not None:
-            self.data_visualizer.plot_bollinger_bands(self.data, 'Close', ticker=self.ticker)
+        self.run_plot('bollinger', lambda data: self.data_visualizer.indicator_engine.bollinger_bands(data['Close'], 20),
+                      lambda data, ticker: self.data_visualizer.plot_bollinger_bands(data, 'Close', ticker=ticker))
 
     def plot_macd(self):
-        if self.data is not None and self.ticker is not None:
-            self.data_visualizer.plot_macd(self.data, 'Close', ticker=self.ticker)
+        self.run_plot('macd', lambda data: self.data_visualizer.indicator_engine.macd(data['Close']),
+                      lambda data, ticker: self.data_visualizer.plot_macd(data, 'Close', ticker=ticker))
 
-    def load_market_data(self):
+    def load_market_data(self, start_date, end_date):
         ticker = "^GSPC"
-        start_date = self.start_date_entry.get()
-        end_date = self.end_date_entry.get()
         market_data = self.data_loader.load_yfinance(ticker, start_date, end_date)
         return market_data
 
@@ -1,19 +1,107 @@
+import argparse
+import glob
+import os
+import sys
+
 import pandas as pd
 from dataLoaderClass import DataLoader
-from statisticalAnalysisClass import DataAnalyzer
+from priceCacheClass import PriceCache
+from statisticalAnalysisClass import AnalysisResult, DataAnalyzer
+from batchAnalysisClass import BatchAnalyzer
+from exporterClass import Exporter
 from visualizationClass import DataVisualizer
-import tkinter as tk
-from tkinter import filedialog
+
+class BatchApp:
+    def __init__(self, workers: int = 1):
+        self.data_loader = DataLoader(cache=PriceCache())
+        self.workers = workers
+        self.frames = {}
+
+    def run(self, tickers, csv_patterns, start, end, metrics, output, market=None, column='Close', charts=None,
+            chart_format='png'):
+        panel = self.load_panel(tickers, csv_patterns, start, end, column, market=market, keep_frames=bool(charts))
+        if panel.empty:
+            print("No data loaded.", file=sys.stderr)
+            return 1
+        if market and market not in panel.columns:
+            print(f"Failed to load market data for {market}.", file=sys.stderr)
+            return 1
+
+        results = self.analyze(panel, market)
+        report = results[metrics].reset_index()
+        self.export(report, output)
+        print(f"Wrote {len(report)} rows to {output}.")
+        if charts:
+            self.export_charts(charts, chart_format, column)
+        return 0
+
+    def load_panel(self, tickers, csv_patterns, start, end, column, market=None, keep_frames=False):
+        # With keep_frames, the sliced CSV frames and downloaded ticker frames
+        # are kept in self.frames so charts reuse them instead of reloading.
+        series = {}
+        self.frames = {}
+        for pattern in csv_patterns:
+            for file_path in sorted(glob.glob(pattern)):
+                data = self.data_loader.load_csv(file_path)
+                if data is None or column not in data.columns:
+                    print(f"Failed to load {column} from {file_path}.", file=sys.stderr)
+                    continue
+                if isinstance(data.index, pd.DatetimeIndex):
+                    data = data.loc[start:end]
+                name = os.path.splitext(os.path.basename(file_path))[0]
+                series[name] = data[column]
+                if keep_frames:
+                    self.frames[name] = data
+        # The market may name one of the CSV files; only download it if not.
+        downloads = list(tickers) + ([market] if market and market not in tickers and market not in series else [])
+        if downloads:
+            panel = self.data_loader.load_many(downloads, start, end, column=column, keep_frames=keep_frames)
+            series.update({ticker: panel[ticker] for ticker in panel.columns})
+            self.frames.update({ticker: frame for ticker, frame in self.data_loader.frames.items() if ticker in tickers})
+            for ticker, error in self.data_loader.failures.items():
+                print(f"Failed to load {ticker}: {error}", file=sys.stderr)
+        if not series:
+            return pd.DataFrame()
+        return pd.concat(series, axis=1).sort_index()
+
+    def analyze(self, panel, market):
+        if self.workers > 1:
+            from parallelRunnerClass import ParallelRunner
+            return ParallelRunner(workers=self.workers, data_loader=self.data_loader).run(panel, market=market)
+        return BatchAnalyzer().analyze(panel, market=market)
+
+    def export_charts(self, directory, fmt, column):
+        from chartBookClass import ChartBook
+        # The frames load_panel kept: CSVs already sliced to --start/--end and
+        # tickers as downloaded, so nothing is read or fetched twice.
+        chart_book = ChartBook(directory, fmt=fmt, workers=self.workers)
+        written = chart_book.export(self.frames, column=column)
+        for ticker, error in chart_book.failures.items():
+            print(f"Failed to chart {ticker}: {error}", file=sys.stderr)
+        print(f"Wrote {len(written)} charts to {directory}.")
+
+    def export(self, report, output):
+        exporter = Exporter(report)
+        if output.endswith('.xlsx'):
+            exporter.export_to_xlsx(output)
+        elif output.endswith('.parquet'):
+            exporter.export_to_parquet(output)
+        elif output.endswith('.feather'):
+            exporter.export_to_feather(output)
+        else:
+            exporter.export_to_csv(output)
 
 class ConsoleApp:
     def __init__(self):
-        self.data_loader = DataLoader()
+        self.data_loader = DataLoader(cache=PriceCache())
         self.data_analyzer = DataAnalyzer()
         self.data_visualizer = DataVisualizer()
         self.data = None
         self.ticker = None
 
     def load_csv(self):
+        import tkinter as tk
+        from tkinter import filedialog
         root = tk.Tk()
         root.withdraw()  
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
@@ -227,6 +315,29 @@ class ConsoleApp:
             else:
                 print("Invalid choice. Please try again.")
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Financial analysis. Runs the interactive menu unless a batch is given.")
+    parser.add_argument('--tickers', nargs='+', default=[], help="Yahoo Finance tickers to analyze.")
+    parser.add_argument('--csv', nargs='+', default=[], help="CSV files or glob patterns to analyze.")
+    parser.add_argument('--start', help="Start date (YYYY-MM-DD).")
+    parser.add_argument('--end', help="End date (YYYY-MM-DD).")
+    parser.add_argument('--metrics', nargs='+', default=list(AnalysisResult._fields), choices=AnalysisResult._fields)
+    parser.add_argument('--market', help="Ticker or CSV name to use as the market for beta and alpha.")
+    parser.add_argument('--column', default='Close')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', default='report.csv', help="Report file (.csv, .xlsx, .parquet or .feather).")
+    parser.add_argument('--charts', help="Directory to render every chart type into, one file per ticker and chart.")
+    parser.add_argument('--chart-format', default='png', choices=['png', 'svg'])
+    args = parser.parse_args(argv)
+
+    if not args.tickers and not args.csv:
+        ConsoleApp().run()
+        return 0
+    if args.tickers and not (args.start and args.end):
+        parser.error("--start and --end are required with --tickers.")
+    return BatchApp(args.workers).run(args.tickers, args.csv, args.start, args.end, args.metrics, args.output,
+                                      market=args.market, column=args.column, charts=args.charts,
+                                      chart_format=args.chart_format)
+
 if __name__ == "__main__":
-    app = ConsoleApp()
-    app.run()
+    sys.exit(main())
@@ -0,0 +1,119 @@
+from typing import NamedTuple
+
+import pandas as pd
+import numpy as np
+from indicatorClass import IndicatorEngine
+from statisticalAnalysisClass import (
+    TRADING_DAYS, returns_from_prices, nan_mean, cagr_from_prices, volatility_from_returns, sharpe_from_returns,
+    max_drawdown_from_returns,
+)
+
+STRATEGIES = ('ma_crossover', 'rsi', 'bollinger', 'macd')
+BACKTEST_METRICS = ['total_return', 'cagr', 'volatility', 'sharpe_ratio', 'max_drawdown', 'turnover', 'trades',
+                    'exposure']
+
+
+class BacktestResult(NamedTuple):
+    positions: pd.DataFrame
+    returns: pd.DataFrame
+    equity: pd.DataFrame
+    metrics: pd.DataFrame
+
+
+def hold_signals(signals: np.ndarray) -> np.ndarray:
+    # Forward-fill entry/exit events (NaN = no event) down the time axis so a
+    # position is held until the opposite event; flat before the first one.
+    rows = np.arange(len(signals)).reshape((-1,) + (1,) * (signals.ndim - 1))
+    last_event = np.maximum.accumulate(np.where(np.isnan(signals), -1, rows), axis=0)
+    held = np.take_along_axis(signals, np.maximum(last_event, 0), axis=0)
+    return np.where(last_event >= 0, held, 0.0)
+
+
+class Backtester:
+    def __init__(self, indicator_engine: IndicatorEngine = None, cost: float = 0.0, allow_short: bool = False,
+                 periods_per_year: int = TRADING_DAYS, risk_free_rate: float = 0.0):
+        # cost is charged per unit of position change, e.g. 0.001 for 10 bp.
+        self.indicator_engine = indicator_engine or IndicatorEngine()
+        self.cost = cost
+        self.allow_short = allow_short
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
+
+    def positions(self, prices: pd.DataFrame, strategy: str, **params) -> pd.DataFrame:
+        matrix = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+        return pd.DataFrame(self.position_matrix(matrix, strategy, **params), index=prices.index,
+                            columns=prices.columns)
+
+    def position_matrix(self, prices: np.ndarray, strategy: str, **params) -> np.ndarray:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        positions = getattr(self, f'_{strategy}')(prices, **params)
+        if not self.allow_short:
+            positions = np.maximum(positions, 0.0)
+        return positions
+
+    def run(self, prices: pd.DataFrame, strategy: str, **params) -> BacktestResult:
+        positions = self.positions(prices, strategy, **params)
+        return self.evaluate(prices, positions)
+
+    def evaluate(self, prices: pd.DataFrame, positions: pd.DataFrame) -> BacktestResult:
+        asset_returns = np.nan_to_num(returns_from_prices(prices.to_numpy(dtype=np.float64, na_value=np.nan)))
+        returns, equity, metrics = self.evaluate_matrix(asset_returns, positions.to_numpy(dtype=np.float64))
+        return BacktestResult(
+            positions=positions,
+            returns=pd.DataFrame(returns, index=prices.index, columns=prices.columns),
+            equity=pd.DataFrame(equity, index=prices.index, columns=prices.columns),
+            metrics=pd.DataFrame(metrics, index=pd.Index(prices.columns, name='Ticker'), columns=BACKTEST_METRICS),
+        )
+
+    def evaluate_matrix(self, asset_returns: np.ndarray, positions: np.ndarray):
+        # Works on any (dates x ...) shape, e.g. (dates x parameter sets x
+        # tickers) with asset_returns broadcast as (dates x 1 x tickers).
+        # A position decided on a bar's close earns the next bar's return.
+        previous = np.concatenate([np.zeros_like(positions[:1]), positions[:-1]])
+        changes = np.abs(np.diff(positions, axis=0, prepend=0.0))
+        returns = previous * asset_returns - self.cost * changes
+        returns[0] = np.nan
+        equity = np.cumprod(np.nan_to_num(returns) + 1, axis=0)
+
+        years = max(len(positions) - 1, 1) / self.periods_per_year
+        metrics = {
+            'total_return': equity[-1] - 1,
+            'cagr': cagr_from_prices(equity, self.periods_per_year),
+            'volatility': volatility_from_returns(returns),
+            'sharpe_ratio': sharpe_from_returns(returns, self.risk_free_rate),
+            'max_drawdown': max_drawdown_from_returns(returns),
+            'turnover': changes.sum(axis=0) / years,
+            'trades': np.count_nonzero(changes, axis=0),
+            'exposure': nan_mean(np.where(np.isnan(returns), np.nan, previous != 0)),
+        }
+        return returns, equity, metrics
+
+    def _ma_crossover(self, prices, short_window: int = 20, long_window: int = 50):
+        # short_window=1 compares the price itself with the long average, as
+        # plot_moving_average draws it.
+        short = prices if short_window == 1 else self.indicator_engine.sma(prices, short_window)
+        long = self.indicator_engine.sma(prices, long_window)
+        return self._side(short - long)
+
+    def _rsi(self, prices, window: int = 14, lower: float = 30, upper: float = 70):
+        # Mean reversion on the plot_rsi levels: long once oversold, short
+        # (or flat) once overbought, held in between.
+        rsi = self.indicator_engine.rsi(prices, window)
+        signals = np.where(rsi < lower, 1.0, np.where(rsi > upper, -1.0, np.nan))
+        return hold_signals(signals)
+
+    def _bollinger(self, prices, window: int = 20, num_std: float = 2):
+        # Breakout: long on a close above the upper band, short (or flat) on
+        # a close below the lower band.
+        _, upper, lower = self.indicator_engine.bollinger_bands(prices, window, num_std)
+        signals = np.where(prices > upper, 1.0, np.where(prices < lower, -1.0, np.nan))
+        return hold_signals(signals)
+
+    def _macd(self, prices, short_window: int = 12, long_window: int = 26, signal_window: int = 9):
+        macd, signal_line = self.indicator_engine.macd(prices, short_window, long_window, signal_window)
+        return self._side(macd - signal_line)
+
+    def _side(self, spread):
+        # NaN during the indicator warm-up means no position.
+        return np.where(spread > 0, 1.0, np.where(spread < 0, -1.0, 0.0))
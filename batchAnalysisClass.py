@@ -0,0 +1,55 @@
+import pandas as pd
+import numpy as np
+from statisticalAnalysisClass import (
+    AnalysisResult, TRADING_DAYS, returns_from_prices, nan_mean, nan_var, nan_median, cagr_from_prices,
+    volatility_from_returns, sharpe_from_returns, max_drawdown_from_returns, beta_from_returns, alpha_from_returns,
+)
+
+
+class BatchAnalyzer:
+    def analyze(self, prices, market=None, periods_per_year: int = TRADING_DAYS,
+                risk_free_rate: float = 0.0, tickers=None) -> pd.DataFrame:
+        matrix, tickers, market_prices = self._split(prices, market, tickers)
+        returns = returns_from_prices(matrix)
+
+        variance = nan_var(matrix)
+        metrics = {
+            'mean': nan_mean(matrix),
+            'median': nan_median(matrix),
+            'std': np.sqrt(variance),
+            'variance': variance,
+            'cagr': cagr_from_prices(matrix, periods_per_year),
+            'volatility': volatility_from_returns(returns),
+            'sharpe_ratio': sharpe_from_returns(returns, risk_free_rate),
+            'max_drawdown': max_drawdown_from_returns(returns),
+            'beta': np.full(len(tickers), np.nan),
+            'alpha': np.full(len(tickers), np.nan),
+        }
+        if market_prices is not None:
+            market_returns = returns_from_prices(market_prices)
+            metrics['beta'] = beta_from_returns(returns, market_returns)
+            metrics['alpha'] = alpha_from_returns(returns, market_returns, metrics['beta'], risk_free_rate)
+
+        return pd.DataFrame(metrics, index=pd.Index(tickers, name='Ticker'), columns=list(AnalysisResult._fields))
+
+    def _split(self, prices, market, tickers):
+        market_prices = None
+        if isinstance(prices, pd.DataFrame):
+            if isinstance(market, str):
+                market_prices = prices[market].to_numpy(dtype=np.float64, na_value=np.nan)
+                prices = prices.drop(columns=market)
+            if tickers is None:
+                tickers = list(prices.columns)
+            prices = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+        matrix = np.asarray(prices, dtype=np.float64)
+        if matrix.ndim == 1:
+            matrix = matrix[:, None]
+        if market is not None and market_prices is None:
+            if isinstance(market, pd.Series):
+                market = market.to_numpy(dtype=np.float64, na_value=np.nan)
+            market_prices = np.asarray(market, dtype=np.float64)
+            if market_prices.shape != (len(matrix),):
+                raise ValueError("Market prices must have one value per row of the price matrix.")
+        if tickers is None:
+            tickers = list(range(matrix.shape[1]))
+        return matrix, tickers, market_prices
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from dataLoaderClass import DataLoader
+from statisticalAnalysisClass import DataAnalyzer
+from batchAnalysisClass import BatchAnalyzer
+from indicatorClass import IndicatorEngine
+from exporterClass import Exporter
+
+
+def make_ohlcv(rows: int, seed: int = 0, start: str = '2000-01-03', freq: str = 'min') -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, rows)))
+    open_ = close * np.exp(rng.normal(0, 0.0005, rows))
+    spread = np.abs(rng.normal(0, 0.001, rows)) * close
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 10_000, rows),
+    }, index=pd.date_range(start, periods=rows, freq=freq, name='Date'))
+
+
+def make_panel(rows: int, tickers: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (rows, tickers)), axis=0))
+    return pd.DataFrame(prices, columns=[f'T{i}' for i in range(tickers)],
+                        index=pd.date_range('2000-01-03', periods=rows, freq='B', name='Date'))
+
+
+class Benchmark:
+    def __init__(self, sizes=(1_000, 10_000, 100_000), ticker_counts=(1, 100, 1_000), repeat: int = 3):
+        self.sizes = sizes
+        self.ticker_counts = ticker_counts
+        self.repeat = repeat
+        self.results = []
+
+    def run(self) -> dict:
+        self.results = []
+        for rows in self.sizes:
+            self._bench_loader(rows)
+            self._bench_analyzer(rows)
+            self._bench_indicators(rows)
+            self._bench_exporter(rows)
+        for tickers in self.ticker_counts:
+            panel = make_panel(2_520, tickers)
+            self.measure(f'BatchAnalyzer.analyze[tickers={tickers}]',
+                         lambda: BatchAnalyzer().analyze(panel, market=panel.columns[0]))
+        return {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'results': self.results,
+        }
+
+    def measure(self, name: str, function):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        tracemalloc.start()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.results.append({'name': name, 'seconds': min(timings), 'peak_bytes': peak})
+
+    def _bench_loader(self, rows):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'prices.csv')
+            make_ohlcv(rows).to_csv(file_path)
+            self.measure(f'DataLoader.load_csv[rows={rows}]', lambda: DataLoader().load_csv(file_path))
+
+    def _bench_analyzer(self, rows):
+        data = make_ohlcv(rows, seed=1)
+        market_data = make_ohlcv(rows, seed=2)
+        data_analyzer = DataAnalyzer()
+        calls = {
+            'calculate_mean': lambda: data_analyzer.calculate_mean(data, 'Close'),
+            'calculate_median': lambda: data_analyzer.calculate_median(data, 'Close'),
+            'calculate_std': lambda: data_analyzer.calculate_std(data, 'Close'),
+            'calculate_variance': lambda: data_analyzer.calculate_variance(data, 'Close'),
+            'calculate_cagr': lambda: data_analyzer.calculate_cagr(data, 'Close', 252),
+            'calculate_daily_return': lambda: data_analyzer.calculate_daily_return(data, 'Close'),
+            'calculate_annualized_volatility': lambda: data_analyzer.calculate_annualized_volatility(data, 'Close'),
+            'calculate_sharpe_ratio': lambda: data_analyzer.calculate_sharpe_ratio(data, 'Close'),
+            'calculate_beta': lambda: data_analyzer.calculate_beta(data, market_data, 'Close'),
+            'calculate_alpha': lambda: data_analyzer.calculate_alpha(data, market_data, 'Close'),
+            'calculate_max_drawdown': lambda: data_analyzer.calculate_max_drawdown(data, 'Close'),
+            'compute_all': lambda: data_analyzer.compute_all(data, 'Close', market_data=market_data),
+        }
+        for name, call in calls.items():
+            self.measure(f'DataAnalyzer.{name}[rows={rows}]', call)
+
+    def _bench_exporter(self, rows):
+        data = make_ohlcv(rows, seed=4)
+        writers = {
+            'csv': lambda exporter, file_path: exporter.export_to_csv(file_path),
+            'parquet': lambda exporter, file_path: exporter.export_to_parquet(file_path),
+            'feather': lambda exporter, file_path: exporter.export_to_feather(file_path),
+            'store': lambda exporter, file_path: exporter.export_to_store(file_path),
+        }
+        # openpyxl needs minutes for the larger sizes.
+        if rows <= 10_000:
+            writers['xlsx'] = lambda exporter, file_path: exporter.export_to_xlsx(file_path)
+        with tempfile.TemporaryDirectory() as directory:
+            for name, write in writers.items():
+                file_path = os.path.join(directory, f'prices.{name}')
+                self.measure(f'Exporter.{name}[rows={rows}]', lambda: write(Exporter(data), file_path))
+                self.results[-1]['rows_per_second'] = rows / self.results[-1]['seconds']
+                self.results[-1]['file_bytes'] = self._size(file_path)
+
+    def _size(self, file_path):
+        if os.path.isdir(file_path):
+            return sum(os.path.getsize(os.path.join(file_path, name)) for name in os.listdir(file_path))
+        return os.path.getsize(file_path)
+
+    def _bench_indicators(self, rows):
+        close = make_ohlcv(rows, seed=3)['Close']
+        # A fresh engine per call, so the numbers are for computing, not cache hits.
+        calls = {
+            'sma': lambda: IndicatorEngine().sma(close, 20),
+            'rsi': lambda: IndicatorEngine().rsi(close, 14),
+            'bollinger_bands': lambda: IndicatorEngine().bollinger_bands(close, 20),
+            'macd': lambda: IndicatorEngine().macd(close),
+        }
+        for name, call in calls.items():
+            self.measure(f'IndicatorEngine.{name}[rows={rows}]', call)
+
+
+ENTRY_POINTS = {
+    'app': ['app'],
+    'app2': ['app2'],
+    'analysis': ['dataLoaderClass', 'statisticalAnalysisClass', 'batchAnalysisClass', 'exporterClass'],
+}
+HEAVY_MODULES = ['tkinter', 'matplotlib', 'mplfinance', 'yfinance']
+
+
+def import_time(modules) -> dict:
+    script = f"import sys, {', '.join(modules)}; print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], capture_output=True, text=True,
+                            check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    # Each stderr line is "import time: self [us] | cumulative | name";
+    # top-level imports are the ones whose name is not indented.
+    microseconds = 0
+    for line in result.stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() in modules and fields[2] == ' ' + fields[2].strip():
+            microseconds += int(fields[1])
+    return {'seconds': microseconds / 1e6, 'heavy_modules': result.stdout.split()}
+
+
+def startup(budget_seconds: float) -> dict:
+    results = {name: import_time(modules) for name, modules in ENTRY_POINTS.items()}
+    analysis = results['analysis']
+    results['analysis']['within_budget'] = analysis['seconds'] <= budget_seconds and not analysis['heavy_modules']
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float = 0.2) -> list:
+    previous = {result['name']: result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        before = previous.get(result['name'])
+        if before is None:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if before[metric] and result[metric] > before[metric] * (1 + threshold):
+                regressions.append({'name': result['name'], 'metric': metric,
+                                    'baseline': before[metric], 'current': result[metric]})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the loader, analyzer, indicator and exporter hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1, 100, 1_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="JSON results to compare against.")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed slowdown, 0.2 means 20%%.")
+    parser.add_argument('--startup', action='store_true', help="Only measure entry point import times.")
+    parser.add_argument('--import-budget', type=float, default=1.0,
+                        help="Seconds the analysis-only import path may take.")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        results = startup(args.import_budget)
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        for name, result in results.items():
+            heavy = ', '.join(result['heavy_modules']) or '-'
+            print(f"{name:<10} {result['seconds'] * 1000:>8.1f} ms  heavy modules: {heavy}")
+        if not results['analysis']['within_budget']:
+            print(f"Analysis-only imports exceed the {args.import_budget:.2f}s budget or load GUI/network modules.")
+            return 1
+        return 0
+
+    results = Benchmark(args.sizes, args.tickers, args.repeat).run()
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    for result in results['results']:
+        print(f"{result['name']:<60} {result['seconds'] * 1000:>10.2f} ms {result['peak_bytes'] / 1024 ** 2:>9.1f} MiB")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression['name']} {regression['metric']}: "
+                  f"{regression['baseline']:.6g} -> {regression['current']:.6g}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from dataLoaderClass import DataLoader
+from parallelRunnerClass import worker_throughput
+from visualizationClass import CHARTS, DataVisualizer
+
+
+def _use_agg():
+    # Workers never open windows; pin the non-interactive backend before
+    # mplfinance pulls in pyplot.
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_chunk(items, output_dir, charts, fmt, column, dpi, max_points, max_bars):
+    # One visualizer and one Figure per worker chunk: the figure is cleared
+    # and redrawn for every chart instead of allocating a new one each time.
+    started = time.perf_counter()
+    data_visualizer = DataVisualizer(max_points=max_points, max_bars=max_bars)
+    figure = None
+    written, failures = [], {}
+    for ticker, source in items:
+        try:
+            data = DataLoader().load_csv(source) if isinstance(source, str) else source
+            if data is None:
+                raise ValueError(f"could not load {source}")
+            for chart in charts:
+                kwargs = {} if chart in ('volume', 'candlestick') else {'column': column}
+                file_path = os.path.join(output_dir, f'{ticker}_{chart}.{fmt}')
+                figure = data_visualizer.save_chart(chart, data, ticker, file_path, figure=figure, dpi=dpi, **kwargs)
+                written.append(file_path)
+        except Exception as e:
+            failures[ticker] = repr(e)
+        # Indicators are never reused across tickers here.
+        data_visualizer.indicator_engine.clear()
+    return written, failures, os.getpid(), len(items), time.perf_counter() - started
+
+
+class ChartBook:
+    def __init__(self, output_dir: str, charts=CHARTS, fmt: str = 'png', workers: int = None, chunk_size: int = 20,
+                 dpi: int = 100, max_points: int = 2000, max_bars: int = 250):
+        if fmt not in ('png', 'svg'):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.output_dir = output_dir
+        self.charts = tuple(charts)
+        self.fmt = fmt
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.dpi = dpi
+        self.max_points = max_points
+        self.max_bars = max_bars
+        self.failures = {}
+        self.throughput = None
+
+    def export(self, sources: dict, column: str = 'Close') -> list:
+        # sources maps ticker -> DataFrame, or ticker -> CSV path so workers
+        # load the file themselves instead of receiving a pickled frame.
+        for chart in self.charts:
+            if chart not in CHARTS:
+                raise ValueError(f"Unknown chart: {chart}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        items = list(sources.items())
+        arguments = (self.output_dir, self.charts, self.fmt, column, self.dpi, self.max_points, self.max_bars)
+        chunks = [items[start:start + self.chunk_size] for start in range(0, len(items), self.chunk_size)]
+
+        if self.workers == 1:
+            results = [_render_chunk(chunk, *arguments) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_use_agg) as executor:
+                futures = [executor.submit(_render_chunk, chunk, *arguments) for chunk in chunks]
+                results = [future.result() for future in futures]
+
+        written = []
+        self.failures = {}
+        for files, failures, _, _, _ in results:
+            written.extend(files)
+            self.failures.update(failures)
+        self.throughput = self._throughput(results)
+        return written
+
+    def _throughput(self, results) -> pd.DataFrame:
+        return worker_throughput([(pid, count, seconds) for _, _, pid, count, seconds in results])
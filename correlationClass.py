@@ -0,0 +1,155 @@
+import pandas as pd
+import numpy as np
+from statisticalAnalysisClass import returns_from_prices
+
+
+class CorrelationMatrix:
+    def __init__(self, window: int = None, dtype=np.float64, block_size: int = 1_000):
+        # window=None accumulates every return since fit(); otherwise only the
+        # last window rows count and older ones are subtracted as days arrive.
+        self.window = window
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        self.tickers = []
+
+    def fit(self, prices: pd.DataFrame):
+        self.tickers = list(prices.columns)
+        matrix = prices.to_numpy(dtype=np.float64, na_value=np.nan)
+        returns = returns_from_prices(matrix)[1:]
+        self.last_prices = matrix[-1]
+        # Covariance does not change under a shift, and shifting by the mean
+        # keeps the running sums far from cancellation, even in float32.
+        valid = ~np.isnan(returns)
+        self.shift = np.where(valid.any(axis=0), np.nansum(returns, axis=0) / np.maximum(valid.sum(axis=0), 1), 0.0)
+        if self.window is not None:
+            returns = returns[-self.window:]
+        self._refit(self._shifted(returns))
+        return self
+
+    def update(self, prices):
+        # One new row (a Series keyed by ticker) or several (a DataFrame):
+        # a rank-k update of the sums, O(k * tickers^2) instead of a refit.
+        rows = prices.to_frame().T if isinstance(prices, pd.Series) else prices
+        matrix = rows.reindex(columns=self.tickers).to_numpy(dtype=np.float64, na_value=np.nan)
+        previous = np.vstack([self.last_prices, matrix[:-1]])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = self._shifted(matrix / previous - 1)
+        # As in returns_from_prices, a missing price leaves the next return
+        # NaN rather than spanning the gap.
+        self.last_prices = matrix[-1]
+
+        if self.window is None:
+            self._accumulate(returns, 1)
+            return self
+        self.buffer = np.vstack([self.buffer, returns])
+        self._accumulate(returns, 1)
+        expired = len(self.buffer) - self.window
+        if expired > 0:
+            self._accumulate(self.buffer[:expired], -1)
+            self.buffer = self.buffer[expired:]
+        # Adding and subtracting drifts slowly; rebuilding once per window
+        # keeps the error bounded at the same amortized cost.
+        self.updates += len(returns)
+        if self.updates >= self.window:
+            self._refit(self.buffer)
+        return self
+
+    def covariance(self) -> pd.DataFrame:
+        return self._frame(self._compute(correlation=False))
+
+    def correlation(self) -> pd.DataFrame:
+        return self._frame(self._compute(correlation=True))
+
+    def iter_blocks(self, correlation: bool = True):
+        # (row tickers, column tickers, block) without materializing the
+        # whole matrix, for universes where tickers^2 does not fit in memory.
+        for rows in self._blocks():
+            for columns in self._blocks():
+                yield (self.tickers[rows], self.tickers[columns],
+                       self._block(rows, columns, correlation))
+
+    def _refit(self, returns):
+        self.buffer = returns if self.window is not None else None
+        self.updates = 0
+        size = len(self.tickers)
+        self.dense = True
+        self.count = 0.0
+        self.sums = np.zeros(size, dtype=self.dtype)
+        self.squares = np.zeros(size, dtype=self.dtype)
+        self.cross = np.zeros((size, size), dtype=self.dtype)
+        self._accumulate(returns, 1)
+
+    def _accumulate(self, returns, sign):
+        if len(returns) == 0:
+            return
+        valid = ~np.isnan(returns)
+        values = np.where(valid, returns, 0).astype(self.dtype)
+        if self.dense and not valid.all():
+            self._to_pairwise()
+        if self.dense:
+            self.count += sign * len(returns)
+            self.sums += sign * values.sum(axis=0)
+            self.squares += sign * (values * values).sum(axis=0)
+            self._gram(values, values, self.cross, sign)
+            return
+        mask = valid.astype(self.dtype)
+        # Pairwise-complete sums, like DataFrame.corr: only rows where both
+        # tickers have a return count towards that pair.
+        self._gram(mask, mask, self.count, sign)
+        self._gram(values, mask, self.sums, sign)
+        self._gram(values * values, mask, self.squares, sign)
+        self._gram(values, values, self.cross, sign)
+
+    def _to_pairwise(self):
+        size = len(self.tickers)
+        self.count = np.full((size, size), self.count, dtype=self.dtype)
+        self.sums = np.repeat(self.sums[:, None], size, axis=1)
+        self.squares = np.repeat(self.squares[:, None], size, axis=1)
+        self.dense = False
+
+    def _gram(self, left, right, out, sign):
+        # out += sign * left' @ right, one BLAS call per block so temporaries
+        # stay at block_size^2; left' @ left only needs the upper blocks.
+        symmetric = left is right
+        for rows in self._blocks():
+            for columns in self._blocks():
+                if symmetric and columns.start < rows.start:
+                    continue
+                product = sign * (left[:, rows].T @ right[:, columns])
+                out[rows, columns] += product
+                if symmetric and columns.start > rows.start:
+                    out[columns, rows] += product.T
+
+    def _compute(self, correlation):
+        size = len(self.tickers)
+        result = np.empty((size, size), dtype=self.dtype)
+        for rows in self._blocks():
+            for columns in self._blocks():
+                result[rows, columns] = self._block(rows, columns, correlation)
+        return result
+
+    def _block(self, rows, columns, correlation):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.dense:
+                count = self.count
+                sums_rows, sums_columns = self.sums[rows][:, None], self.sums[columns][None, :]
+                squares_rows, squares_columns = self.squares[rows][:, None], self.squares[columns][None, :]
+            else:
+                count = self.count[rows, columns]
+                sums_rows, sums_columns = self.sums[rows, columns], self.sums[columns, rows].T
+                squares_rows, squares_columns = self.squares[rows, columns], self.squares[columns, rows].T
+            covariance = (self.cross[rows, columns] - sums_rows * sums_columns / count) / (count - 1)
+            if correlation:
+                variance_rows = (squares_rows - sums_rows ** 2 / count) / (count - 1)
+                variance_columns = (squares_columns - sums_columns ** 2 / count) / (count - 1)
+                covariance = covariance / np.sqrt(variance_rows * variance_columns)
+            return np.where(count > 1, covariance, np.nan).astype(self.dtype)
+
+    def _blocks(self):
+        return [slice(start, start + self.block_size) for start in range(0, len(self.tickers), self.block_size)]
+
+    def _shifted(self, returns):
+        return returns - self.shift
+
+    def _frame(self, matrix):
+        return pd.DataFrame(matrix, index=self.tickers, columns=self.tickers)
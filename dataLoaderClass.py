@@ -1,11 +1,41 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pandas as pd
-import yfinance as yf
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+VOLUME_COLUMN = 'Volume'
+DATE_COLUMN = 'Date'
+
+class RateLimiter:
+    def __init__(self, max_per_second: float):
+        self.interval = 1.0 / max_per_second if max_per_second else 0.0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
 
 class DataLoader:
-    def load_csv(self, file_path):
+    def __init__(self, cache=None, fetch=None):
+        self.cache = cache
+        self.fetch = fetch
+        self.failures = {}
+        self.frames = {}
+
+    def load_csv(self, file_path, price_dtype=np.float64):
         try:
-            data = pd.read_csv(file_path)
-            return data
+            data = pd.read_csv(file_path, **self._csv_schema(file_path, price_dtype))
+            return self._downcast_volume(data)
         except FileNotFoundError:
             print(f"File {file_path} not found.")
         except pd.errors.EmptyDataError:
@@ -13,9 +43,109 @@ class DataLoader:
         except Exception as e:
             print(f"An error occurred: {e}")
 
+    def iter_csv(self, file_path, chunksize: int = 100_000, price_dtype=np.float64):
+        # Volume stays float64 here: a later batch may hold a blank, and every
+        # batch of one stream should share a dtype.
+        with pd.read_csv(file_path, chunksize=chunksize, **self._csv_schema(file_path, price_dtype)) as reader:
+            for batch in reader:
+                yield batch
+
+    def load_store(self, dir_path, columns=None, start=None, end=None):
+        try:
+            with open(os.path.join(dir_path, 'meta.json')) as file:
+                meta = json.load(file)
+            length = meta['length']
+            lo, hi, index = 0, length, None
+            if meta['index'] is not None:
+                index = self._open_column(dir_path, meta['index'], length)
+                if meta['index']['sorted']:
+                    if start is not None:
+                        lo = int(np.searchsorted(index, np.datetime64(pd.Timestamp(start)), side='left'))
+                    if end is not None:
+                        hi = int(np.searchsorted(index, np.datetime64(pd.Timestamp(end)), side='right'))
+                elif start is not None or end is not None:
+                    raise ValueError("Date slicing needs a store written from a sorted index.")
+                index = pd.DatetimeIndex(index[lo:hi], name=meta['index']['name'])
+            wanted = meta['columns'] if columns is None else [entry for entry in meta['columns'] if entry['name'] in columns]
+            # Slices of the memmaps are views, so only the pages a caller touches get read.
+            data = {entry['name']: self._open_column(dir_path, entry, length)[lo:hi] for entry in wanted}
+            return pd.DataFrame(data, index=index, copy=False)
+        except FileNotFoundError:
+            print(f"Store {dir_path} not found.")
+        except Exception as e:
+            print(f"An error occurred: {e}")
+
     def load_yfinance(self, ticker, start, end):
         try:
-            data = yf.download(ticker, start=start, end=end)
-            return data
+            return self._download(ticker, start, end)
         except Exception as e:
             print(f"An error occurred: {e}")
+
+    def load_many(self, tickers, start, end, column: str = 'Close', workers: int = 8,
+                  max_per_second: float = 5.0, retries: int = 3, backoff: float = 0.5,
+                  keep_frames: bool = False) -> pd.DataFrame:
+        # With keep_frames, the full downloaded frames are left in self.frames
+        # for callers that need every OHLCV column, e.g. charts.
+        limiter = RateLimiter(max_per_second)
+        frames = {}
+
+        def fetch_one(ticker):
+            for attempt in range(retries + 1):
+                limiter.wait()
+                try:
+                    data = self._download(ticker, start, end)
+                    if data is None or data.empty:
+                        raise ValueError(f"No data returned for {ticker}.")
+                    prices = data[column]
+                    if keep_frames:
+                        frames[ticker] = data.set_axis(data.columns.get_level_values(0), axis=1)
+                    return prices.iloc[:, 0] if isinstance(prices, pd.DataFrame) else prices
+                except Exception as e:
+                    if attempt == retries:
+                        return e
+                    time.sleep(backoff * 2 ** attempt)
+
+        tickers = list(dict.fromkeys(tickers))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(tickers, executor.map(fetch_one, tickers)))
+
+        self.failures = {ticker: str(result) for ticker, result in results.items() if isinstance(result, Exception)}
+        self.frames = frames
+        series = {ticker: result for ticker, result in results.items() if not isinstance(result, Exception)}
+        if not series:
+            return pd.DataFrame(columns=pd.Index([], name='Ticker'))
+        panel = pd.concat(series, axis=1, names=['Ticker']).sort_index()
+        return panel
+
+    def _csv_schema(self, file_path, price_dtype):
+        columns = pd.read_csv(file_path, nrows=0).columns
+        dtype = {column: price_dtype for column in PRICE_COLUMNS if column in columns}
+        if VOLUME_COLUMN in columns:
+            # Parsed as float so blanks and "100.0" load; see _downcast_volume.
+            dtype[VOLUME_COLUMN] = np.float64
+        schema = {'dtype': dtype}
+        if DATE_COLUMN in columns:
+            schema.update(parse_dates=[DATE_COLUMN], index_col=DATE_COLUMN)
+        return schema
+
+    def _downcast_volume(self, data):
+        if VOLUME_COLUMN in data.columns:
+            volume = data[VOLUME_COLUMN].to_numpy()
+            if np.isfinite(volume).all() and (volume == np.round(volume)).all():
+                data[VOLUME_COLUMN] = volume.astype(np.int64)
+        return data
+
+    def _open_column(self, dir_path, entry, length):
+        if length == 0:
+            return np.empty(0, dtype=entry['dtype'])
+        column = np.memmap(os.path.join(dir_path, entry['file']), dtype=entry['dtype'], mode='r', shape=(length,))
+        return np.asarray(column)
+
+    def _download(self, ticker, start, end):
+        if self.fetch is not None:
+            return self.fetch(ticker, start, end)
+        if self.cache is not None and start and end:
+            return self.cache.get(ticker, start, end)
+        # yfinance is slow to import, so only pay for it when downloading.
+        import yfinance as yf
+        return yf.download(ticker, start=start, end=end)
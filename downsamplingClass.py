@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from resamplingClass import aggregate_ohlcv
+
+
+class Downsampler:
+    def minmax_indices(self, values, buckets: int) -> np.ndarray:
+        # Keep the lowest and highest point of every pixel-wide bucket, which
+        # draws the same envelope as plotting every point.
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n <= 2 * buckets:
+            return np.arange(n)
+        size = -(-n // buckets)
+        padded = np.full(buckets * size, np.nan)
+        padded[:n] = values
+        rows = padded.reshape(buckets, size)
+        empty = np.isnan(rows).all(axis=1)
+        rows = np.where(empty[:, None], 0.0, rows)
+        offsets = np.arange(buckets) * size
+        low = offsets + np.nanargmin(rows, axis=1)
+        high = offsets + np.nanargmax(rows, axis=1)
+        indices = np.concatenate([low[~empty], high[~empty], [0, n - 1]])
+        return np.unique(indices[indices < n])
+
+    def lttb_indices(self, x, y, threshold: int) -> np.ndarray:
+        # Largest-Triangle-Three-Buckets: one point per bucket, chosen to keep
+        # the visual shape. Each bucket depends on the previous pick, so the
+        # loop is over buckets (screen columns), never over raw points.
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = len(y)
+        if threshold >= n or threshold < 3:
+            return np.arange(n)
+        edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+        indices = np.empty(threshold, dtype=np.int64)
+        indices[0], indices[-1] = 0, n - 1
+        previous = 0
+        for bucket in range(threshold - 2):
+            start, stop = edges[bucket], edges[bucket + 1]
+            next_start, next_stop = stop, edges[bucket + 2] if bucket + 2 < len(edges) else n
+            average_x = x[next_start:next_stop].mean()
+            average_y = y[next_start:next_stop].mean()
+            areas = np.abs((x[previous] - average_x) * (y[start:stop] - y[previous])
+                           - (x[previous] - x[start:stop]) * (average_y - y[previous]))
+            previous = start + int(np.argmax(areas))
+            indices[bucket + 1] = previous
+        return indices
+
+    def resample_ohlc(self, data: pd.DataFrame, max_bars: int) -> pd.DataFrame:
+        if len(data) <= max_bars:
+            return data
+        size = -(-len(data) // max_bars)
+        starts = np.arange(0, len(data), size)
+        return pd.DataFrame(aggregate_ohlcv(data, starts), index=data.index[starts])
@@ -1,18 +1,150 @@
+import json
+import os
+
+import numpy as np
 import pandas as pd
 
+STORE_VERSION = 1
+STORE_META_FILE = 'meta.json'
+STORE_INDEX_FILE = '__index__.bin'
+
+PARQUET_PART = 'part-{:05d}.parquet'
+
 class Exporter:
     def __init__(self, data):
+        # data is a DataFrame, or an iterable of DataFrames (e.g. from
+        # DataLoader.iter_csv) that the writers consume batch by batch.
         self.data = data
 
-    def export_to_csv(self, file_path):
+    def export_to_csv(self, file_path, append: bool = False):
         try:
-            self.data.to_csv(file_path, index=False)
+            header = not (append and os.path.exists(file_path) and os.path.getsize(file_path) > 0)
+            mode = 'a' if append else 'w'
+            for batch in self._batches():
+                batch.to_csv(file_path, index=self._keeps_index(batch), mode=mode, header=header)
+                mode, header = 'a', False
         except Exception as e:
             print(f"An error occurred while exporting to CSV: {e}")
 
     def export_to_xlsx(self, file_path):
         try:
-            self.data.to_excel(file_path, index=False)
+            # xlsxwriter is several times faster than openpyxl when installed.
+            try:
+                import xlsxwriter  # noqa: F401
+                engine = 'xlsxwriter'
+            except ImportError:
+                engine = None
+            # Batches go into one sheet one after another, below the header
+            # the first one writes.
+            row = 0
+            with pd.ExcelWriter(file_path, engine=engine) as writer:
+                for batch in self._batches():
+                    batch.to_excel(writer, index=self._keeps_index(batch), startrow=row, header=row == 0)
+                    row += len(batch) + (row == 0)
         except Exception as e:
             print(f"An error occurred while exporting to XLSX: {e}")
 
+    def export_to_parquet(self, file_path, compression: str = 'snappy', append: bool = False):
+        try:
+            import pyarrow.parquet as pq
+            if append:
+                # Parquet files cannot be appended to, so an appendable export
+                # is a dataset directory that gains one part file per run;
+                # pd.read_parquet(file_path) reads the parts back in order.
+                os.makedirs(file_path, exist_ok=True)
+                parts = [name for name in os.listdir(file_path) if name.startswith('part-')]
+                file_path = os.path.join(file_path, PARQUET_PART.format(len(parts)))
+            writer = None
+            try:
+                for table in self._tables():
+                    if writer is None:
+                        schema = table.schema
+                        writer = pq.ParquetWriter(file_path, schema, compression=compression)
+                    writer.write_table(table.cast(schema))
+            finally:
+                if writer is not None:
+                    writer.close()
+        except Exception as e:
+            print(f"An error occurred while exporting to Parquet: {e}")
+
+    def export_to_feather(self, file_path, compression: str = 'zstd'):
+        try:
+            import pyarrow as pa
+            writer = None
+            try:
+                for table in self._tables():
+                    if writer is None:
+                        schema = table.schema
+                        options = pa.ipc.IpcWriteOptions(compression=None if compression == 'uncompressed' else compression)
+                        writer = pa.ipc.new_file(file_path, schema, options=options)
+                    writer.write_table(table.cast(schema))
+            finally:
+                if writer is not None:
+                    writer.close()
+        except Exception as e:
+            print(f"An error occurred while exporting to Feather: {e}")
+
+    def export_to_store(self, dir_path):
+        try:
+            os.makedirs(dir_path, exist_ok=True)
+            meta = {'version': STORE_VERSION, 'length': 0, 'index': None, 'columns': []}
+            files, last_time = None, None
+            try:
+                # Each batch is appended to the column files; the length and
+                # sortedness are only known, and written to meta, at the end.
+                for batch in self._batches():
+                    if files is None:
+                        files = self._open_store(dir_path, batch, meta)
+                    if meta['index'] is not None:
+                        index = batch.index.tz_localize(None) if batch.index.tz is not None else batch.index
+                        if len(index):
+                            meta['index']['sorted'] &= bool(index.is_monotonic_increasing) and (
+                                last_time is None or index[0] >= last_time)
+                            last_time = index[-1]
+                        values = index.values.astype(meta['index']['dtype'], copy=False)
+                        self._write_array(files[STORE_INDEX_FILE], values)
+                    for entry in meta['columns']:
+                        values = batch[entry['name']].to_numpy().astype(entry['dtype'], copy=False)
+                        self._write_array(files[entry['file']], values)
+                    meta['length'] += len(batch)
+            finally:
+                for file in (files or {}).values():
+                    file.close()
+            with open(os.path.join(dir_path, STORE_META_FILE), 'w') as file:
+                json.dump(meta, file)
+        except Exception as e:
+            print(f"An error occurred while exporting to store: {e}")
+
+    def _open_store(self, dir_path, batch, meta):
+        files = {}
+        if isinstance(batch.index, pd.DatetimeIndex):
+            index = batch.index.tz_localize(None) if batch.index.tz is not None else batch.index
+            meta['index'] = {'name': index.name, 'dtype': index.values.dtype.str,
+                             'file': STORE_INDEX_FILE, 'sorted': True}
+        for position, column in enumerate(batch.columns):
+            dtype = batch[column].to_numpy().dtype
+            if dtype.kind not in 'biufM':
+                raise TypeError(f"Column {column!r} has non-numeric dtype {dtype}.")
+            meta['columns'].append({'name': column, 'dtype': dtype.str, 'file': f'{position}.bin'})
+        for entry in ([meta['index']] if meta['index'] is not None else []) + meta['columns']:
+            files[entry['file']] = open(os.path.join(dir_path, entry['file']), 'wb')
+        return files
+
+    def _batches(self):
+        if isinstance(self.data, pd.DataFrame):
+            yield self.data
+        else:
+            yield from self.data
+
+    def _keeps_index(self, data):
+        # DataLoader.load_csv moves Date into the index, so a named or date
+        # index is a column to write back, not a row number.
+        return data.index.name is not None or isinstance(data.index, pd.DatetimeIndex)
+
+    def _tables(self):
+        import pyarrow as pa
+        for batch in self._batches():
+            yield pa.Table.from_pandas(batch)
+
+    def _write_array(self, file, values):
+        np.ascontiguousarray(values).tofile(file)
@@ -0,0 +1,131 @@
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class IndicatorEngine:
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+        self.lock = threading.Lock()
+        self.dead = []
+        self.hits = 0
+        self.misses = 0
+
+    def sma(self, series, window: int) -> np.ndarray:
+        return self._cached(series, 'sma', (window,),
+                            lambda values: values.rolling(window=window).mean())
+
+    def rolling_std(self, series, window: int) -> np.ndarray:
+        return self._cached(series, 'rolling_std', (window,),
+                            lambda values: values.rolling(window=window).std())
+
+    def bollinger_bands(self, series, window: int = 20, num_std: float = 2):
+        sma = self.sma(series, window)
+        std = self.rolling_std(series, window)
+        upper = self._cached(series, 'bollinger_upper', (window, num_std), lambda values: sma + std * num_std)
+        lower = self._cached(series, 'bollinger_lower', (window, num_std), lambda values: sma - std * num_std)
+        return sma, upper, lower
+
+    def ema(self, series, span: int) -> np.ndarray:
+        return self._cached(series, 'ema', (span,),
+                            lambda values: values.ewm(span=span, adjust=False).mean())
+
+    def macd(self, series, short_window: int = 12, long_window: int = 26, signal_window: int = 9):
+        short_ema = self.ema(series, short_window)
+        long_ema = self.ema(series, long_window)
+        macd = self._cached(series, 'macd', (short_window, long_window), lambda values: short_ema - long_ema)
+        signal_line = self._cached(series, 'macd_signal', (short_window, long_window, signal_window),
+                                   lambda values: self._frame(macd).ewm(span=signal_window, adjust=False).mean())
+        return macd, signal_line
+
+    def rsi(self, series, window: int = 14) -> np.ndarray:
+        def compute(values):
+            delta = values.diff(1)
+            gain = delta.mask(delta < 0, 0)
+            loss = -delta.mask(delta > 0, 0)
+            rs = gain.rolling(window=window).mean() / loss.rolling(window=window).mean()
+            return 100 - (100 / (1 + rs))
+        return self._cached(series, 'rsi', (window,), compute)
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+
+    def _cached(self, series, name, params, compute):
+        # Keyed on the caller's own buffer, before any dtype conversion, so
+        # float32 prices hit too; the content token makes an in-place edit
+        # of that buffer a miss instead of a stale hit.
+        raw = self._raw(series)
+        owner, series_key = self._series_key(raw)
+        key = (series_key, self._token(owner, raw), name, params)
+        with self.lock:
+            self._purge()
+            entry = self.cache.get(key)
+            if entry is not None and entry[0]() is owner:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = compute(self._frame(self._values(raw)))
+        if isinstance(result, (pd.Series, pd.DataFrame)):
+            result = result.to_numpy()
+        result = np.asarray(result, dtype=np.float64)
+        # Results are shared between callers, so nobody may write into them.
+        result.setflags(write=False)
+        with self.lock:
+            self.cache[key] = (weakref.ref(owner, lambda _, key=key: self.dead.append(key)), result)
+            while len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        return result
+
+    def _purge(self):
+        # Entries whose buffer was freed can never hit again; the weakref
+        # callback only queues them, since it may fire while the lock is held.
+        while self.dead:
+            key = self.dead.pop()
+            entry = self.cache.get(key)
+            if entry is not None and entry[0]() is None:
+                del self.cache[key]
+
+    def _raw(self, series) -> np.ndarray:
+        values = series.to_numpy() if isinstance(series, (pd.Series, pd.DataFrame)) else np.asarray(series)
+        if values.dtype == object:
+            return self._values(series)
+        return values
+
+    def _values(self, series) -> np.ndarray:
+        if isinstance(series, (pd.Series, pd.DataFrame)):
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.asarray(series, dtype=np.float64)
+
+    def _frame(self, values):
+        # A (dates x tickers) matrix runs every ticker through the same
+        # pandas rolling/ewm kernels in one call.
+        if values.ndim == 2:
+            return pd.DataFrame(values, copy=False)
+        return pd.Series(values, copy=False)
+
+    def _series_key(self, values):
+        # A column's values are a view into the frame's block; key on the
+        # owning buffer plus the view's position so repeated lookups of the
+        # same column hit, and hold the owner weakly so a freed and reused
+        # address can never match a stale entry.
+        owner = values
+        while isinstance(owner.base, np.ndarray):
+            owner = owner.base
+        return owner, (id(owner), values.__array_interface__['data'][0], values.shape, values.strides)
+
+    def _token(self, owner, values):
+        # A read-only owner cannot change under us; anything writable is
+        # checksummed, which is far cheaper than the rolling kernels.
+        if not owner.flags.writeable:
+            return None
+        if not values.flags.c_contiguous:
+            values = values.T if values.flags.f_contiguous else np.ascontiguousarray(values)
+        return zlib.crc32(values)
@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from statisticalAnalysisClass import (
+    TRADING_DAYS, DataAnalyzer, column_prices, returns_from_prices, cagr_from_prices, sharpe_from_returns,
+    max_drawdown_from_returns,
+)
+
+SIMULATION_METRICS = ['sharpe_ratio', 'max_drawdown', 'cagr']
+
+
+def simulate_paths(returns: np.ndarray, method: str, horizon: int, count: int, seed, start_price: float = 1.0,
+                   block_size: int = 20) -> np.ndarray:
+    # (horizon + 1) x count price paths starting at start_price; time runs
+    # down axis 0 so the metric kernels apply to the matrix unchanged.
+    rng = np.random.default_rng(seed)
+    if method == 'gbm':
+        log_returns = np.log1p(returns)
+        drift, sigma = log_returns.mean(), log_returns.std(ddof=1)
+        steps = rng.standard_normal((horizon, count))
+        steps *= sigma
+        steps += drift
+        np.cumsum(steps, axis=0, out=steps)
+        np.exp(steps, out=steps)
+    elif method == 'bootstrap':
+        # Circular block bootstrap: whole blocks of consecutive history keep
+        # the short-range autocorrelation and volatility clustering.
+        blocks = -(-horizon // block_size)
+        starts = rng.integers(0, len(returns), (blocks, 1, count))
+        rows = (starts + np.arange(block_size)[None, :, None]) % len(returns)
+        steps = 1 + returns[rows.reshape(blocks * block_size, count)[:horizon]]
+        np.cumprod(steps, axis=0, out=steps)
+    else:
+        raise ValueError(f"Unknown simulation method: {method}")
+    paths = np.empty((horizon + 1, count))
+    paths[0] = start_price
+    np.multiply(steps, start_price, out=paths[1:])
+    return paths
+
+
+def _simulate_metrics(returns, method, horizon, count, seed, start_price, block_size, periods_per_year,
+                      risk_free_rate):
+    paths = simulate_paths(returns, method, horizon, count, seed, start_price, block_size)
+    path_returns = returns_from_prices(paths)
+    return np.vstack([
+        sharpe_from_returns(path_returns, risk_free_rate),
+        max_drawdown_from_returns(path_returns),
+        cagr_from_prices(paths, periods_per_year),
+    ])
+
+
+class MonteCarloSimulator:
+    def __init__(self, seed=None, chunk_size: int = 2_000, workers: int = 1):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.workers = workers or os.cpu_count()
+
+    def iter_paths(self, data: pd.DataFrame, column: str, horizon: int, n_paths: int, method: str = 'gbm',
+                   block_size: int = 20):
+        # Forward simulation from the last price, chunk_size paths at a time.
+        prices = column_prices(data, column)
+        returns = self._returns(prices)
+        start_price = prices[~np.isnan(prices)][-1]
+        for count, seed in self._chunks(n_paths):
+            yield simulate_paths(returns, method, horizon, count, seed, start_price, block_size)
+
+    def simulate(self, data: pd.DataFrame, column: str, horizon: int, n_paths: int, method: str = 'gbm',
+                 block_size: int = 20) -> np.ndarray:
+        return np.hstack(list(self.iter_paths(data, column, horizon, n_paths, method, block_size)))
+
+    def confidence_intervals(self, data: pd.DataFrame, column: str, n_paths: int = 10_000, method: str = 'bootstrap',
+                             confidence: float = 0.95, block_size: int = 20, periods_per_year: int = TRADING_DAYS,
+                             risk_free_rate: float = 0.0) -> pd.DataFrame:
+        # Resamples histories as long as the observed one and measures each
+        # with the same kernels as calculate_sharpe_ratio, calculate_max_drawdown
+        # and calculate_cagr; the interval is the percentile range.
+        prices = column_prices(data, column)
+        returns = self._returns(prices)
+        arguments = (returns, method, len(returns), prices[~np.isnan(prices)][0], block_size, periods_per_year,
+                     risk_free_rate)
+        samples = self._sample_metrics(arguments, n_paths)
+
+        data_analyzer = DataAnalyzer()
+        estimate = [data_analyzer.calculate_sharpe_ratio(data, column, risk_free_rate),
+                    data_analyzer.calculate_max_drawdown(data, column),
+                    data_analyzer.calculate_cagr(data, column, periods_per_year)]
+        tail = (1 - confidence) / 2
+        return pd.DataFrame({
+            'estimate': estimate,
+            'mean': np.nanmean(samples, axis=1),
+            'std': np.nanstd(samples, axis=1, ddof=1),
+            'lower': np.nanquantile(samples, tail, axis=1),
+            'upper': np.nanquantile(samples, 1 - tail, axis=1),
+        }, index=pd.Index(SIMULATION_METRICS, name='metric'))
+
+    def _sample_metrics(self, arguments, n_paths) -> np.ndarray:
+        # Only the per-path metrics (3 x n_paths) outlive a chunk. Chunk seeds
+        # come from one SeedSequence, so results do not depend on workers.
+        returns, method, horizon, start_price, block_size, periods_per_year, risk_free_rate = arguments
+        tasks = [(returns, method, horizon, count, seed, start_price, block_size, periods_per_year, risk_free_rate)
+                 for count, seed in self._chunks(n_paths)]
+        if self.workers == 1 or len(tasks) == 1:
+            chunks = [_simulate_metrics(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                chunks = list(executor.map(_simulate_metrics, *zip(*tasks)))
+        return np.hstack(chunks)
+
+    def _chunks(self, n_paths):
+        counts = [min(self.chunk_size, n_paths - start) for start in range(0, n_paths, self.chunk_size)]
+        return zip(counts, np.random.SeedSequence(self.seed).spawn(len(counts)))
+
+    def _returns(self, prices):
+        returns = returns_from_prices(prices)
+        return returns[~np.isnan(returns)]
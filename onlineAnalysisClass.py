@@ -0,0 +1,157 @@
+import math
+from collections import deque
+
+from statisticalAnalysisClass import TRADING_DAYS
+
+
+class RunningMoments:
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+
+    def update(self, value: float):
+        # Welford's update keeps the variance stable without storing history.
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+
+class OnlineAnalyzer:
+    def __init__(self, risk_free_rate: float = 0.0, short_window: int = 12, long_window: int = 26,
+                 signal_window: int = 9, rsi_window: int = 14):
+        self.risk_free_rate = risk_free_rate
+        self.short_window = short_window
+        self.long_window = long_window
+        self.signal_window = signal_window
+        self.rsi_window = rsi_window
+
+        self.prices = RunningMoments()
+        self.returns = RunningMoments()
+        self.last_price = None
+        self.first_price = None
+        self.peak = None
+        self.max_drawdown = math.nan
+
+        self.short_ema = self.long_ema = self.signal_line = None
+        self.gains = deque(maxlen=rsi_window)
+        self.losses = deque(maxlen=rsi_window)
+        self.gain_sum = self.loss_sum = 0.0
+        # Exact counts of non-zero gains and losses in the window, so a flat
+        # stretch reads as zero regardless of rounding in the running sums.
+        self.gain_count = self.loss_count = 0
+        self.rsi_updates = 0
+
+    def update(self, price: float):
+        price = float(price)
+        if math.isnan(price):
+            return
+        self.prices.update(price)
+        if self.last_price is None:
+            self.first_price = self.peak = price
+            self.short_ema = self.long_ema = price
+            self.signal_line = 0.0
+        else:
+            self.returns.update(price / self.last_price - 1 - self.risk_free_rate / TRADING_DAYS)
+            self._update_drawdown(price)
+            self._update_macd(price)
+            self._update_rsi(price - self.last_price)
+        self.last_price = price
+
+    def update_batch(self, prices):
+        for price in prices:
+            self.update(price)
+
+    @property
+    def mean(self) -> float:
+        return self.prices.mean if self.prices.count else math.nan
+
+    @property
+    def variance(self) -> float:
+        return self.prices.variance
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.prices.variance)
+
+    @property
+    def volatility(self) -> float:
+        return math.sqrt(self.returns.variance) * math.sqrt(TRADING_DAYS)
+
+    @property
+    def sharpe_ratio(self) -> float:
+        if self.returns.count < 2 or self.returns.m2 == 0:
+            return math.nan
+        return self.returns.mean / math.sqrt(self.returns.variance) * math.sqrt(TRADING_DAYS)
+
+    @property
+    def macd(self) -> float:
+        return self.short_ema - self.long_ema if self.short_ema is not None else math.nan
+
+    @property
+    def rsi(self) -> float:
+        # Simple moving averages of gains and losses, as in DataVisualizer.plot_rsi.
+        if len(self.gains) < self.rsi_window or self.gain_sum == self.loss_sum == 0:
+            return math.nan
+        if self.loss_sum == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.gain_sum / self.loss_sum)
+
+    def snapshot(self) -> dict:
+        state = {name: value for name, value in vars(self).items() if name not in ('prices', 'returns', 'gains', 'losses')}
+        state['prices'] = vars(self.prices).copy()
+        state['returns'] = vars(self.returns).copy()
+        state['gains'] = list(self.gains)
+        state['losses'] = list(self.losses)
+        return state
+
+    @classmethod
+    def restore(cls, state: dict) -> 'OnlineAnalyzer':
+        analyzer = cls(state['risk_free_rate'], state['short_window'], state['long_window'],
+                       state['signal_window'], state['rsi_window'])
+        for name, value in state.items():
+            if name in ('prices', 'returns'):
+                value = RunningMoments(**value)
+            elif name in ('gains', 'losses'):
+                value = deque(value, maxlen=state['rsi_window'])
+            setattr(analyzer, name, value)
+        return analyzer
+
+    def _update_drawdown(self, price):
+        self.peak = max(self.peak, price)
+        drawdown = (price - self.peak) / self.peak
+        self.max_drawdown = drawdown if math.isnan(self.max_drawdown) else min(self.max_drawdown, drawdown)
+
+    def _update_macd(self, price):
+        self.short_ema += (price - self.short_ema) * 2 / (self.short_window + 1)
+        self.long_ema += (price - self.long_ema) * 2 / (self.long_window + 1)
+        self.signal_line += (self.macd - self.signal_line) * 2 / (self.signal_window + 1)
+
+    def _update_rsi(self, delta):
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        if len(self.gains) == self.rsi_window:
+            self.gain_sum -= self.gains[0]
+            self.loss_sum -= self.losses[0]
+            self.gain_count -= self.gains[0] > 0
+            self.loss_count -= self.losses[0] > 0
+        self.gains.append(gain)
+        self.losses.append(loss)
+        self.gain_sum += gain
+        self.loss_sum += loss
+        self.gain_count += gain > 0
+        self.loss_count += loss > 0
+        # Adding and subtracting drifts over long streams; re-summing the
+        # window once per rsi_window bars keeps it bounded at O(1) amortized.
+        self.rsi_updates += 1
+        if self.rsi_updates >= self.rsi_window:
+            self.rsi_updates = 0
+            self.gain_sum, self.loss_sum = math.fsum(self.gains), math.fsum(self.losses)
+        if self.gain_count == 0:
+            self.gain_sum = 0.0
+        if self.loss_count == 0:
+            self.loss_sum = 0.0
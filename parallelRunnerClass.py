@@ -0,0 +1,87 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import numpy as np
+from dataLoaderClass import DataLoader
+from batchAnalysisClass import BatchAnalyzer
+from statisticalAnalysisClass import AnalysisResult, TRADING_DAYS
+
+
+def _analyze_chunk(shm_name, shape, start_col, stop_col, tickers, has_market, periods_per_year, risk_free_rate):
+    started = time.perf_counter()
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        # Column-major buffer, so a ticker chunk is one contiguous block.
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+        prices = matrix[:, start_col:stop_col]
+        market = matrix[:, -1] if has_market else None
+        results = BatchAnalyzer().analyze(prices, market=market, periods_per_year=periods_per_year,
+                                          risk_free_rate=risk_free_rate, tickers=tickers)
+        del matrix, prices, market
+    finally:
+        shm.close()
+    return results, os.getpid(), len(tickers), time.perf_counter() - started
+
+
+def worker_throughput(chunks) -> pd.DataFrame:
+    # chunks holds one (pid, tickers, seconds) per finished chunk; the result
+    # has one row per worker process.
+    stats = pd.DataFrame(list(chunks), columns=['worker', 'tickers', 'seconds'])
+    stats = stats.groupby('worker').agg(chunks=('tickers', 'size'), tickers=('tickers', 'sum'),
+                                        seconds=('seconds', 'sum'))
+    stats['tickers_per_second'] = stats['tickers'] / stats['seconds']
+    return stats
+
+
+class ParallelRunner:
+    def __init__(self, workers: int = None, chunk_size: int = 250, data_loader: DataLoader = None):
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.data_loader = data_loader or DataLoader()
+        self.throughput = None
+        self.failures = {}
+
+    def run_tickers(self, tickers, start, end, column: str = 'Close', market_ticker: str = None,
+                    periods_per_year: int = TRADING_DAYS, risk_free_rate: float = 0.0) -> pd.DataFrame:
+        panel = self.data_loader.load_many(list(tickers) + ([market_ticker] if market_ticker else []), start, end,
+                                           column=column)
+        # Tickers that could not be loaded, with the reason, instead of printing.
+        self.failures = dict(self.data_loader.failures)
+        if market_ticker and market_ticker not in panel.columns:
+            return None
+        return self.run(panel, market=market_ticker, periods_per_year=periods_per_year, risk_free_rate=risk_free_rate)
+
+    def run(self, prices: pd.DataFrame, market: str = None, periods_per_year: int = TRADING_DAYS,
+            risk_free_rate: float = 0.0) -> pd.DataFrame:
+        tickers = [ticker for ticker in prices.columns if ticker != market]
+        columns = tickers + ([market] if market is not None else [])
+        shape = (len(prices), len(columns))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        try:
+            matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf, order='F')
+            matrix[:] = prices[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+            del matrix
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(_analyze_chunk, shm.name, shape, start, min(start + self.chunk_size, len(tickers)),
+                                    tickers[start:start + self.chunk_size], market is not None,
+                                    periods_per_year, risk_free_rate)
+                    for start in range(0, len(tickers), self.chunk_size)
+                ]
+                chunks = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        self.throughput = self._throughput(chunks)
+        if not chunks:
+            return pd.DataFrame(columns=list(AnalysisResult._fields))
+        return pd.concat([results for results, _, _, _ in chunks])
+
+    def _throughput(self, chunks) -> pd.DataFrame:
+        return worker_throughput([(pid, count, seconds) for _, pid, count, seconds in chunks])
@@ -0,0 +1,142 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+from indicatorClass import IndicatorEngine
+from rollingAnalysisClass import prefix_sums, window_sums
+from backtestClass import BACKTEST_METRICS, STRATEGIES, Backtester
+from statisticalAnalysisClass import TRADING_DAYS, returns_from_prices
+
+DEFAULT_GRIDS = {
+    'ma_crossover': {'short_window': [1, 5, 10, 20], 'long_window': [50, 100, 150, 200]},
+    'rsi': {'window': [7, 14, 21], 'lower': [20, 25, 30], 'upper': [70, 75, 80]},
+    'bollinger': {'window': [10, 20, 30, 50], 'num_std': [1.5, 2, 2.5, 3]},
+    'macd': {'short_window': [8, 12, 16], 'long_window': [21, 26, 34], 'signal_window': [5, 9, 13]},
+}
+
+
+class SweepIndicators(IndicatorEngine):
+    # Rolling means over any window are differences of one prefix sum, so a
+    # grid of windows costs one cumulative pass plus a subtraction per window.
+    # EMAs are already cached per span by IndicatorEngine, so every MACD in
+    # the grid that shares a span reuses it.
+    def sma(self, series, window: int) -> np.ndarray:
+        prefix = self._prefix(series, 'values', lambda values: values)
+        return self._cached(series, 'sma', (window,), lambda values: window_sums(None, window, prefix) / window)
+
+    def rolling_std(self, series, window: int) -> np.ndarray:
+        # Centered on the series mean so the sum of squares does not cancel.
+        total = self._prefix(series, 'centered', lambda values: values - values.mean())
+        total_sq = self._prefix(series, 'centered_sq', lambda values: (values - values.mean()) ** 2)
+
+        def compute(values):
+            sums = window_sums(None, window, total)
+            variance = (window_sums(None, window, total_sq) - sums ** 2 / window) / (window - 1)
+            return np.sqrt(np.maximum(variance, 0))
+        return self._cached(series, 'rolling_std', (window,), compute)
+
+    def rsi(self, series, window: int = 14) -> np.ndarray:
+        gains = self._prefix(series, 'gain', lambda values: values.diff(1).clip(lower=0))
+        losses = self._prefix(series, 'loss', lambda values: (-values.diff(1)).clip(lower=0))
+
+        def compute(values):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rs = window_sums(None, window, gains) / window_sums(None, window, losses)
+                return 100 - (100 / (1 + rs))
+        return self._cached(series, 'rsi', (window,), compute)
+
+    def _prefix(self, series, name, transform):
+        stacked = self._cached(series, f'prefix_{name}', (),
+                               lambda values: np.stack(prefix_sums(np.asarray(transform(values), dtype=np.float64))))
+        return stacked[0], stacked[1]
+
+
+def _sweep_backtester(prices, cost, allow_short, periods_per_year, risk_free_rate, max_entries):
+    # Read-only prices let the indicator cache skip checksumming them.
+    prices.setflags(write=False)
+    return prices, Backtester(SweepIndicators(max_entries=max_entries), cost, allow_short, periods_per_year,
+                              risk_free_rate)
+
+
+def _sweep_chunk(state, strategy, names, combinations):
+    # Positions for a chunk of parameter sets are stacked as (dates x sets x
+    # tickers) and evaluated in one pass; memory is bounded by the chunk.
+    # The backtester's SweepIndicators outlive the chunk, so prefix sums and
+    # EMAs are built once per process for the whole grid.
+    prices, backtester = state
+    positions = np.stack([backtester.position_matrix(prices, strategy, **dict(zip(names, combination)))
+                          for combination in combinations], axis=1)
+    asset_returns = np.nan_to_num(returns_from_prices(prices))[:, None, :]
+    _, _, metrics = backtester.evaluate_matrix(asset_returns, positions)
+    return {name: values.ravel() for name, values in metrics.items()}
+
+
+_worker_state = None
+
+
+def _init_sweep_worker(*args):
+    # The price matrix reaches each worker once, through the initializer,
+    # rather than being pickled into every task.
+    global _worker_state
+    _worker_state = _sweep_backtester(*args)
+
+
+def _sweep_worker_chunk(strategy, names, combinations):
+    return _sweep_chunk(_worker_state, strategy, names, combinations)
+
+
+class ParameterSweep:
+    def __init__(self, workers: int = 1, chunk_size: int = 64, cost: float = 0.0, allow_short: bool = False,
+                 periods_per_year: int = TRADING_DAYS, risk_free_rate: float = 0.0):
+        # Peak memory is about chunk_size x dates x tickers x 8 bytes per worker.
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.cost = cost
+        self.allow_short = allow_short
+        self.periods_per_year = periods_per_year
+        self.risk_free_rate = risk_free_rate
+
+    def run(self, prices: pd.DataFrame, strategy: str, grid: dict = None, rank_by: str = 'sharpe_ratio',
+            ascending: bool = False) -> pd.DataFrame:
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        grid = grid or DEFAULT_GRIDS[strategy]
+        names = list(grid)
+        combinations = [combination for combination in itertools.product(*grid.values())
+                        if self._valid(dict(zip(names, combination)))]
+        matrix = prices.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        # The indicator LRU keeps a chunk's per-combination outputs; shared
+        # prefix sums and EMAs are hit by every chunk and stay resident.
+        setup = (matrix, self.cost, self.allow_short, self.periods_per_year, self.risk_free_rate,
+                 8 * self.chunk_size + 16)
+        batches = [combinations[start:start + self.chunk_size] for start in range(0, len(combinations), self.chunk_size)]
+
+        if self.workers == 1 or len(batches) <= 1:
+            state = _sweep_backtester(*setup)
+            chunks = [_sweep_chunk(state, strategy, names, batch) for batch in batches]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_sweep_worker,
+                                     initargs=setup) as executor:
+                chunks = list(executor.map(_sweep_worker_chunk, [strategy] * len(batches), [names] * len(batches),
+                                           batches))
+
+        if not chunks:
+            return pd.DataFrame(columns=names + ['Ticker'] + BACKTEST_METRICS)
+        table = pd.DataFrame(np.repeat(combinations, len(prices.columns), axis=0), columns=names)
+        for name in names:
+            table[name] = table[name].astype(np.asarray(grid[name]).dtype)
+        table['Ticker'] = np.tile(np.asarray(prices.columns, dtype=object), len(combinations))
+        for metric in BACKTEST_METRICS:
+            table[metric] = np.concatenate([chunk[metric] for chunk in chunks])
+        table = table.sort_values(rank_by, ascending=ascending, kind='stable', na_position='last')
+        table.insert(0, 'rank', table.groupby('Ticker').cumcount() + 1)
+        return table.reset_index(drop=True)
+
+    def _valid(self, params) -> bool:
+        if 'short_window' in params and 'long_window' in params:
+            return params['short_window'] < params['long_window']
+        if 'lower' in params and 'upper' in params:
+            return params['lower'] < params['upper']
+        return True
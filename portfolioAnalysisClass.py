@@ -0,0 +1,121 @@
+import pandas as pd
+import numpy as np
+from statisticalAnalysisClass import (
+    TRADING_DAYS, returns_from_prices, nan_mean, cagr_from_prices, volatility_from_returns, sharpe_from_returns,
+    max_drawdown_from_returns,
+)
+
+PORTFOLIO_METRICS = ['return', 'volatility', 'sharpe_ratio', 'max_drawdown', 'cagr']
+
+
+class PortfolioAnalyzer:
+    def __init__(self, prices: pd.DataFrame, periods_per_year: int = TRADING_DAYS):
+        self.index = prices.index
+        self.tickers = list(prices.columns)
+        self.periods_per_year = periods_per_year
+        returns = returns_from_prices(prices.to_numpy(dtype=np.float64, na_value=np.nan))[1:]
+        # A missing return (not listed yet, or a gap) is a flat day for that
+        # asset, so every portfolio's value path stays defined.
+        self.returns = np.where(np.isnan(returns), 0.0, returns)
+        self.mean = self.returns.mean(axis=0)
+        centered = self.returns - self.mean
+        self.covariance = centered.T @ centered / max(len(self.returns) - 1, 1)
+
+    def volatility(self, weights) -> np.ndarray:
+        # sqrt(w' S w) per weight vector, annualized like volatility_from_returns.
+        weights = self._weights(weights)
+        return np.sqrt(self._quadratic(weights)) * np.sqrt(TRADING_DAYS)
+
+    def sharpe_ratio(self, weights, risk_free_rate: float = 0.0) -> np.ndarray:
+        weights = self._weights(weights)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return ((weights @ self.mean - risk_free_rate / TRADING_DAYS) / np.sqrt(self._quadratic(weights))
+                    * np.sqrt(TRADING_DAYS))
+
+    def values(self, weights, rebalance=None) -> pd.DataFrame:
+        weights, names = self._weights(weights), self._names(weights)
+        return pd.DataFrame(self._values(weights, rebalance), index=self.index, columns=names)
+
+    def analyze(self, weights, rebalance=None, risk_free_rate: float = 0.0, chunk_size: int = 1_000) -> pd.DataFrame:
+        # rebalance=None resets to the target weights every period; an int
+        # rebalances every that many rows and a period alias ('W', 'M', 'Q',
+        # 'Y') at the start of each calendar period, letting weights drift
+        # in between. Value paths are built chunk_size portfolios at a time.
+        names = self._names(weights)
+        weights = self._weights(weights)
+        chunks = []
+        for start in range(0, len(weights), chunk_size):
+            chunk = weights[start:start + chunk_size]
+            values = self._values(chunk, rebalance)
+            returns = returns_from_prices(values)
+            metrics = {
+                'return': nan_mean(returns) * TRADING_DAYS,
+                'max_drawdown': max_drawdown_from_returns(returns),
+                'cagr': cagr_from_prices(values, self.periods_per_year),
+            }
+            if rebalance is None:
+                # Constant weights: the covariance formulation gives the same
+                # numbers as the path without touching the returns matrix.
+                metrics['volatility'] = self.volatility(chunk)
+                metrics['sharpe_ratio'] = self.sharpe_ratio(chunk, risk_free_rate)
+            else:
+                metrics['volatility'] = volatility_from_returns(returns)
+                metrics['sharpe_ratio'] = sharpe_from_returns(returns, risk_free_rate)
+            chunks.append(pd.DataFrame(metrics, columns=PORTFOLIO_METRICS))
+        if not chunks:
+            return pd.DataFrame(columns=PORTFOLIO_METRICS)
+        result = pd.concat(chunks, ignore_index=True)
+        result.index = pd.Index(names, name='Portfolio')
+        return result
+
+    def _values(self, weights, rebalance) -> np.ndarray:
+        # Within a holding period each asset grows by its cumulative return
+        # since the last rebalance, so the value of every portfolio is one
+        # (dates x assets) @ (assets x portfolios) product; the periods are
+        # then chained by the value each one ended on.
+        starts = self._rebalance_starts(rebalance)
+        growth = np.cumprod(1 + self.returns, axis=0)
+        base = np.vstack([np.ones((1, growth.shape[1])), growth])
+        segment = np.searchsorted(starts, np.arange(len(growth)), side='right') - 1
+        # Whatever the weights leave unallocated (1 - sum(w), negative when
+        # leveraged) is cash earning 0, so the path agrees with the w'Sw
+        # volatility and Sharpe for any weights, including dollar-neutral ones.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            period_growth = 1 + (growth / base[starts[segment]] - 1) @ weights.T
+        ends = np.append(starts[1:], len(growth)) - 1
+        carried = np.vstack([np.ones((1, len(weights))), np.cumprod(period_growth[ends], axis=0)[:-1]])
+        values = np.vstack([np.ones((1, len(weights))), carried[segment] * period_growth])
+        return values
+
+    def _rebalance_starts(self, rebalance) -> np.ndarray:
+        rows = len(self.returns)
+        if rebalance is None:
+            return np.arange(rows)
+        if isinstance(rebalance, (int, np.integer)):
+            return np.arange(0, rows, rebalance)
+        periods = self.index[1:].to_period(rebalance)
+        changed = np.ones(rows, dtype=bool)
+        changed[1:] = periods[1:] != periods[:-1]
+        return np.flatnonzero(changed)
+
+    def _quadratic(self, weights) -> np.ndarray:
+        return np.maximum(np.einsum('kn,kn->k', weights @ self.covariance, weights), 0)
+
+    def _weights(self, weights) -> np.ndarray:
+        if isinstance(weights, pd.DataFrame):
+            weights = weights.reindex(columns=self.tickers, fill_value=0.0)
+        elif isinstance(weights, pd.Series):
+            weights = weights.reindex(self.tickers, fill_value=0.0)
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 1:
+            weights = weights[None, :]
+        if weights.shape[1] != len(self.tickers):
+            raise ValueError(f"Expected {len(self.tickers)} weights per portfolio, got {weights.shape[1]}.")
+        return weights
+
+    def _names(self, weights) -> list:
+        if isinstance(weights, pd.DataFrame):
+            return list(weights.index)
+        if isinstance(weights, pd.Series):
+            return [weights.name if weights.name is not None else 0]
+        return list(range(len(self._weights(weights))))
@@ -0,0 +1,171 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import quote
+
+import pandas as pd
+
+
+def yfinance_download(ticker, start, end):
+    import yfinance as yf
+    return yf.download(ticker, start=start, end=end, progress=False)
+
+
+class PriceCache:
+    def __init__(self, cache_dir: str = None, download=None, max_bytes: int = 512 * 1024 ** 2,
+                 volatile_days: int = 3, ttl_seconds: float = 3600, clock=time.time):
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser('~'), '.cache', 'financial-analysis')
+        self.download = download or yfinance_download
+        self.max_bytes = max_bytes
+        self.volatile_days = volatile_days
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.index_path = os.path.join(self.cache_dir, 'index.json')
+        self.index = self._read_index()
+        # Each entry keeps its file's size, so eviction checks a running total
+        # instead of stat-ing every cached file on every get.
+        for ticker, entry in self.index.items():
+            if 'bytes' not in entry:
+                path = self._data_path(ticker)
+                entry['bytes'] = os.path.getsize(path) if os.path.exists(path) else 0
+        self.total_bytes = sum(entry['bytes'] for entry in self.index.values())
+        self.lock = threading.RLock()
+        self.ticker_locks = {}
+
+    def get(self, ticker: str, start, end) -> pd.DataFrame:
+        # Only index and file updates hold the shared lock; downloads hold a
+        # per-ticker lock, so different tickers fetch concurrently while two
+        # requests for the same ticker still fetch its gaps once.
+        with self._ticker_lock(ticker):
+            return self._get(ticker, start, end)
+
+    def _get(self, ticker, start, end):
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        now = self.clock()
+        with self.lock:
+            entry = self.index.get(ticker, {'intervals': []})
+            intervals = [interval for interval in entry['intervals'] if interval[2] is None or interval[2] > now]
+            data = self._read_data(ticker)
+        if data is None:
+            intervals = []
+        changed = ticker not in self.index or intervals != entry['intervals']
+
+        fetched = []
+        for gap_start, gap_end in self._gaps(intervals, start, end):
+            frame = self.download(ticker, gap_start.strftime('%Y-%m-%d'), gap_end.strftime('%Y-%m-%d'))
+            if frame is None or frame.empty:
+                # yf.download returns an empty frame rather than raising when
+                # the fetch fails, so only a non-empty one proves coverage.
+                continue
+            fetched.append(frame)
+            intervals.extend(self._coverage(gap_start, gap_end, now))
+
+        if fetched:
+            data = pd.concat([frame for frame in [data] + fetched if frame is not None and not frame.empty])
+            data = data[~data.index.duplicated(keep='last')].sort_index()
+        with self.lock:
+            # Eviction may have dropped the entry meanwhile; what we hold is
+            # consistent with intervals, so it is simply written back.
+            entry = self.index.setdefault(ticker, {'intervals': [], 'last_access': 0.0, 'bytes': 0})
+            if fetched:
+                path = self._data_path(ticker)
+                data.to_parquet(path)
+                size = os.path.getsize(path)
+                self.total_bytes += size - entry['bytes']
+                entry['bytes'] = size
+            entry['intervals'] = self._merge(intervals)
+            entry['last_access'] = now
+            # A plain hit only touches last_access in memory; it reaches disk
+            # with the next change rather than rewriting index.json per read.
+            if fetched or changed:
+                self._evict(keep=ticker)
+                self._write_index()
+
+        if data is None:
+            return pd.DataFrame()
+        dates = data.index.tz_localize(None) if getattr(data.index, 'tz', None) is not None else data.index
+        return data.loc[(dates >= start) & (dates < end)]
+
+    def clear(self):
+        with self.lock:
+            for ticker in list(self.index):
+                self._remove(ticker)
+            self._write_index()
+
+    def _ticker_lock(self, ticker):
+        with self.lock:
+            return self.ticker_locks.setdefault(ticker, threading.Lock())
+
+    def _coverage(self, start, end, now):
+        # Bars close to "now" may still be revised, so that part of a fetch
+        # is only trusted for ttl_seconds; older bars are cached for good.
+        volatile_from = max(start, pd.Timestamp(now, unit='s').normalize() - pd.Timedelta(days=self.volatile_days))
+        intervals = []
+        if start < volatile_from:
+            intervals.append([start.isoformat(), min(end, volatile_from).isoformat(), None])
+        if volatile_from < end:
+            intervals.append([volatile_from.isoformat(), end.isoformat(), now + self.ttl_seconds])
+        return intervals
+
+    def _gaps(self, intervals, start, end):
+        gaps = []
+        cursor = start
+        for interval_start, interval_end, _ in sorted(intervals, key=lambda interval: interval[0]):
+            interval_start, interval_end = pd.Timestamp(interval_start), pd.Timestamp(interval_end)
+            if interval_end <= cursor or interval_start >= end:
+                continue
+            if interval_start > cursor:
+                gaps.append((cursor, interval_start))
+            cursor = max(cursor, interval_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def _merge(self, intervals):
+        merged = []
+        for interval in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+            if merged and merged[-1][2] is None and interval[2] is None and interval[0] <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], interval[1])
+            else:
+                merged.append(list(interval))
+        return merged
+
+    def _evict(self, keep):
+        if self.total_bytes <= self.max_bytes:
+            return
+        for ticker in sorted(self.index, key=lambda ticker: self.index[ticker]['last_access']):
+            if self.total_bytes <= self.max_bytes:
+                break
+            if ticker != keep:
+                self._remove(ticker)
+
+    def _remove(self, ticker):
+        path = self._data_path(ticker)
+        if os.path.exists(path):
+            os.remove(path)
+        entry = self.index.pop(ticker, None)
+        if entry is not None:
+            self.total_bytes -= entry['bytes']
+
+    def _data_path(self, ticker):
+        return os.path.join(self.cache_dir, quote(ticker, safe='') + '.parquet')
+
+    def _read_data(self, ticker):
+        path = self._data_path(ticker)
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+        return None
+
+    def _read_index(self):
+        try:
+            with open(self.index_path) as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_index(self):
+        # json.dumps runs the C encoder; json.dump to a file does not.
+        with open(self.index_path, 'w') as file:
+            file.write(json.dumps(self.index))
@@ -0,0 +1,110 @@
+import json
+import os
+
+import pandas as pd
+import numpy as np
+from dataLoaderClass import DataLoader
+from exporterClass import STORE_META_FILE, Exporter
+
+PYRAMID_META_FILE = 'pyramid.json'
+RAW_LEVEL = 'raw'
+
+
+def aggregate_ohlcv(data: pd.DataFrame, starts: np.ndarray) -> dict:
+    # One reduceat per column over buckets beginning at the given row
+    # positions: first Open, highest High, lowest Low, last Close, summed
+    # Volume, and the last value of anything else (e.g. Adj Close).
+    ends = np.append(starts[1:], len(data)) - 1
+    bars = {}
+    for column in data.columns:
+        values = data[column].to_numpy()
+        if column == 'Open':
+            bars[column] = values[starts]
+        elif column == 'High':
+            bars[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low':
+            bars[column] = np.fmin.reduceat(values, starts)
+        elif column == 'Volume':
+            bars[column] = np.add.reduceat(values, starts)
+        else:
+            bars[column] = values[ends]
+    return bars
+
+
+class Resampler:
+    def resample(self, data: pd.DataFrame, rule: str) -> pd.DataFrame:
+        # Bars are labelled with the start of their period and only periods
+        # that contain data are emitted, so nights and weekends in minute
+        # data cost nothing.
+        if len(data) == 0:
+            return data
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+        keys = self.period_starts(data.index, rule)
+        starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+        return pd.DataFrame(aggregate_ohlcv(data, starts), index=keys[starts])
+
+    def period_starts(self, index: pd.DatetimeIndex, rule: str) -> pd.DatetimeIndex:
+        try:
+            return index.floor(rule)
+        except ValueError:
+            # Weeks, months, quarters and years are not fixed-length offsets;
+            # periods spell month/quarter/year ends without the trailing E.
+            period = rule[:-1] if rule.endswith(('ME', 'QE', 'YE')) else rule
+            return index.to_period(period).to_timestamp().tz_localize(index.tz).rename(index.name)
+
+
+class OHLCVPyramid:
+    def __init__(self, dir_path: str, levels=('5min', '1h', '1D'), data_loader: DataLoader = None):
+        # Each level is built from the one below it, so every rule must
+        # divide the next one (1m -> 5m -> 1h -> 1d).
+        self.dir_path = dir_path
+        self.levels = list(levels)
+        self.data_loader = data_loader or DataLoader()
+        self.resampler = Resampler()
+
+    def build(self, data: pd.DataFrame):
+        data = data.sort_index()
+        data = data[~data.index.duplicated(keep='last')]
+        # The manifest is only written once every level is, so a failed build
+        # leaves no pyramid.json pointing at missing or stale levels.
+        manifest = os.path.join(self.dir_path, PYRAMID_META_FILE)
+        if os.path.exists(manifest):
+            os.remove(manifest)
+        lengths = {}
+        for level in [RAW_LEVEL] + self.levels:
+            if level != RAW_LEVEL:
+                data = self.resampler.resample(data, level)
+            level_meta = os.path.join(self._level_path(level), STORE_META_FILE)
+            if os.path.exists(level_meta):
+                os.remove(level_meta)
+            # export_to_store reports errors by printing, e.g. for a text column.
+            Exporter(data).export_to_store(self._level_path(level))
+            if not os.path.exists(level_meta):
+                raise ValueError(f"Could not write pyramid level {level}.")
+            lengths[level] = len(data)
+        with open(manifest, 'w') as file:
+            json.dump({'levels': self.levels, 'lengths': lengths}, file)
+
+    def load(self, start=None, end=None, rule: str = None, max_bars: int = None, columns=None) -> pd.DataFrame:
+        # With max_bars, the finest level that fits is read, found by binary
+        # searching each level's stored index rather than scanning any data.
+        return self.data_loader.load_store(self._level_path(rule or self.select(start, end, max_bars)),
+                                           columns=columns, start=start, end=end)
+
+    def select(self, start=None, end=None, max_bars: int = None) -> str:
+        levels = [RAW_LEVEL] + self.stored_levels()
+        if max_bars is None:
+            return RAW_LEVEL
+        for level in levels:
+            index = self.data_loader.load_store(self._level_path(level), columns=[], start=start, end=end)
+            if index is not None and len(index) <= max_bars:
+                return level
+        return levels[-1]
+
+    def stored_levels(self) -> list:
+        with open(os.path.join(self.dir_path, PYRAMID_META_FILE)) as file:
+            return json.load(file)['levels']
+
+    def _level_path(self, level):
+        return os.path.join(self.dir_path, level)
@@ -0,0 +1,85 @@
+import pandas as pd
+import numpy as np
+from statisticalAnalysisClass import TRADING_DAYS, returns_from_prices
+
+
+def prefix_sums(values: np.ndarray):
+    # Cumulative sums and valid counts down axis 0 with a leading zero row,
+    # so the sum over any window is one subtraction.
+    valid = ~np.isnan(values)
+    zeros = np.zeros((1,) + values.shape[1:])
+    totals = np.concatenate([zeros, np.cumsum(np.where(valid, values, 0.0), axis=0)])
+    counts = np.concatenate([zeros, np.cumsum(valid, axis=0)])
+    return totals, counts
+
+
+def window_sums(values: np.ndarray, window: int, prefix=None):
+    # O(n) sliding sums from one cumulative sum; a window with gaps is left
+    # as NaN. Pass prefix to reuse the cumulative sums across windows.
+    totals, counts = prefix if prefix is not None else prefix_sums(values)
+    sums = np.full(totals[1:].shape, np.nan)
+    if window <= len(sums):
+        complete = (counts[window:] - counts[:-window]) == window
+        sums[window - 1:] = np.where(complete, totals[window:] - totals[:-window], np.nan)
+    return sums
+
+
+class RollingAnalyzer:
+    def __init__(self, windows=(63, 252)):
+        self.windows = windows
+
+    def rolling_metrics(self, data: pd.DataFrame, column: str, market_data: pd.DataFrame = None,
+                        risk_free_rate: float = 0.0, windows=None) -> pd.DataFrame:
+        windows = windows or self.windows
+        prices = data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+        returns = returns_from_prices(prices)
+        excess_return = returns - risk_free_rate / TRADING_DAYS
+        # Centering before the cumulative sums keeps the sum-of-squares
+        # variance from cancelling catastrophically on long series.
+        center = np.nanmean(excess_return) if np.any(~np.isnan(excess_return)) else 0.0
+        centered = excess_return - center
+        # One cumulative pass per series; every window below is a subtraction.
+        total_prefix = prefix_sums(centered)
+        total_sq_prefix = prefix_sums(centered ** 2)
+
+        beta_prefixes = None
+        if market_data is not None:
+            market_prices = market_data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            market_returns = pd.Series(returns_from_prices(market_prices), index=market_data.index)
+            market_returns = market_returns.reindex(data.index).to_numpy()
+            paired = ~np.isnan(returns) & ~np.isnan(market_returns)
+            stock_paired = np.where(paired, returns - np.nanmean(returns[paired]), np.nan)
+            market_paired = np.where(paired, market_returns - np.nanmean(market_returns[paired]), np.nan)
+            beta_prefixes = [prefix_sums(values) for values in
+                             (stock_paired, market_paired, stock_paired * market_paired, market_paired ** 2)]
+
+        metrics = {}
+        for window in windows:
+            total = window_sums(None, window, total_prefix)
+            total_sq = window_sums(None, window, total_sq_prefix)
+            mean = total / window
+            with np.errstate(invalid='ignore', divide='ignore'):
+                std = np.sqrt(np.maximum(total_sq - total * mean, 0) / (window - 1))
+                metrics[('volatility', window)] = std * np.sqrt(TRADING_DAYS)
+                metrics[('sharpe_ratio', window)] = (mean + center) / std * np.sqrt(TRADING_DAYS)
+            metrics[('drawdown', window)] = prices / pd.Series(prices).rolling(window=window + 1).max().to_numpy() - 1
+            if beta_prefixes is not None:
+                metrics[('beta', window)] = self._rolling_beta(beta_prefixes, window)
+
+        result = pd.DataFrame(metrics, index=data.index)
+        result.columns = pd.MultiIndex.from_tuples(result.columns, names=['metric', 'window'])
+        return result
+
+    def drawdown(self, data: pd.DataFrame, column: str) -> pd.Series:
+        prices = data[column]
+        return prices / prices.cummax() - 1
+
+    def _rolling_beta(self, prefixes, window):
+        # Same convention as calculate_beta: sample covariance over the
+        # market's population variance. prefixes holds the prefix sums of the
+        # stock, market, cross and squared market returns.
+        sum_stock, sum_market, sum_cross, sum_market_sq = [window_sums(None, window, prefix) for prefix in prefixes]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            covariance = (sum_cross - sum_stock * sum_market / window) / (window - 1)
+            market_var = (sum_market_sq - sum_market ** 2 / window) / window
+            return covariance / market_var
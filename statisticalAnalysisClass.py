@@ -1,60 +1,292 @@
+from typing import NamedTuple
+
 import pandas as pd
 import numpy as np
+from timeSeriesClass import TimeSeries
+
+TRADING_DAYS = 252
+
+
+class AnalysisResult(NamedTuple):
+    mean: float
+    median: float
+    std: float
+    variance: float
+    cagr: float
+    volatility: float
+    sharpe_ratio: float
+    max_drawdown: float
+    beta: float
+    alpha: float
+
+
+# Array kernels shared by DataAnalyzer and the batch/portfolio engines. They all
+# reduce along axis 0, so a 1-D price series and a 2-D (dates x tickers) matrix
+# go through the same code. NaNs are skipped the way pandas skips them.
+
+def returns_from_prices(prices: np.ndarray) -> np.ndarray:
+    prices = np.asarray(prices, dtype=np.float64)
+    returns = np.full(prices.shape, np.nan)
+    if len(prices) > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.divide(prices[1:], prices[:-1], out=returns[1:])
+        returns[1:] -= 1
+    return returns
+
+
+def nan_mean(values: np.ndarray):
+    count = np.sum(~np.isnan(values), axis=0)
+    total = np.nansum(values, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def nan_var(values: np.ndarray, ddof: int = 1):
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    mean = nan_mean(values)
+    deviations = np.where(valid, values - mean, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > ddof, (deviations ** 2).sum(axis=0) / (count - ddof), np.nan)
+
+
+def nan_median(values: np.ndarray):
+    valid = ~np.isnan(values)
+    if valid.all():
+        return np.median(values, axis=0)
+    # nanmedian warns on all-NaN columns, so feed those a dummy value and blank them after.
+    filled = np.where(valid.any(axis=0), values, 0.0)
+    return np.where(valid.any(axis=0), np.nanmedian(filled, axis=0), np.nan)
+
+
+def cagr_from_prices(prices: np.ndarray, periods_per_year: int):
+    prices = np.asarray(prices, dtype=np.float64)
+    valid = ~np.isnan(prices)
+    has_data = valid.any(axis=0)
+    first = np.argmax(valid, axis=0)
+    last = len(prices) - 1 - np.argmax(valid[::-1], axis=0)
+    start_value = np.take_along_axis(prices, np.expand_dims(first, 0), axis=0)[0]
+    end_value = np.take_along_axis(prices, np.expand_dims(last, 0), axis=0)[0]
+    n_periods = (len(prices) - first) / periods_per_year
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cagr = (end_value / start_value) ** (1 / n_periods) - 1
+    return np.where(has_data, cagr, np.nan)
+
+
+def volatility_from_returns(returns: np.ndarray):
+    return np.sqrt(nan_var(returns)) * np.sqrt(TRADING_DAYS)
+
+
+def sharpe_from_returns(returns: np.ndarray, risk_free_rate: float = 0.0):
+    excess_return = returns - risk_free_rate / TRADING_DAYS
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return nan_mean(excess_return) / np.sqrt(nan_var(excess_return)) * np.sqrt(TRADING_DAYS)
+
+
+def max_drawdown_from_returns(returns: np.ndarray):
+    valid = ~np.isnan(returns)
+    cumulative_return = np.cumprod(np.where(valid, 1 + returns, 1.0), axis=0)
+    peak = np.maximum.accumulate(cumulative_return, axis=0)
+    drawdown = (cumulative_return - peak) / peak
+    return np.where(valid.any(axis=0), drawdown.min(axis=0, initial=0.0), np.nan)
+
+
+def paired_moments(stock_returns: np.ndarray, market_returns: np.ndarray):
+    # Count, sums and cross sums over the rows where both returns exist.
+    # With one market series against a 2-D stock matrix these are all
+    # matrix-vector products, so the whole universe is a handful of BLAS calls.
+    market_valid = ~np.isnan(market_returns)
+    # Shifting the market by its mean keeps the sum formulas well conditioned.
+    market = np.where(market_valid, market_returns - nan_mean(market_returns), 0.0)
+    stock_valid = ~np.isnan(stock_returns)
+    stock = np.where(stock_valid, stock_returns, 0.0)
+    if stock_returns.ndim == 2 and market_returns.ndim == 1:
+        market_valid = market_valid.astype(np.float64)
+        stock_valid = stock_valid.astype(np.float64)
+        count = stock_valid.T @ market_valid
+        return (count, stock.T @ market_valid, stock_valid.T @ market, (stock * stock).T @ market_valid,
+                stock_valid.T @ (market * market), stock.T @ market)
+    paired = stock_valid & market_valid
+    stock, market = stock * paired, market * paired
+    return (paired.sum(axis=0), stock.sum(axis=0), market.sum(axis=0), (stock * stock).sum(axis=0),
+            (market * market).sum(axis=0), (stock * market).sum(axis=0))
+
+
+def beta_from_returns(stock_returns: np.ndarray, market_returns: np.ndarray, moments=None):
+    # Sample covariance over the market's population variance, on the rows
+    # where both returns exist -- the same convention as np.cov / np.var.
+    count, sum_stock, sum_market, _, sum_market_sq, sum_cross = moments or paired_moments(stock_returns, market_returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = (sum_cross - sum_stock * sum_market / count) / (count - 1)
+        market_var = (sum_market_sq - sum_market ** 2 / count) / count
+        return np.where(count > 1, covariance / market_var, np.nan)
+
+
+def alpha_from_returns(stock_returns: np.ndarray, market_returns: np.ndarray, beta, risk_free_rate: float = 0.0):
+    stock_return = nan_mean(stock_returns) * TRADING_DAYS
+    market_return = nan_mean(market_returns) * TRADING_DAYS
+    return stock_return - (risk_free_rate + beta * (market_return - risk_free_rate))
+
+
+def correlation_from_returns(stock_returns: np.ndarray, market_returns: np.ndarray, moments=None):
+    count, sum_stock, sum_market, sum_stock_sq, sum_market_sq, sum_cross = moments or paired_moments(stock_returns, market_returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sum_cross - sum_stock * sum_market / count
+        stock_var = sum_stock_sq - sum_stock ** 2 / count
+        market_var = sum_market_sq - sum_market ** 2 / count
+        return np.where(count > 1, covariance / np.sqrt(stock_var * market_var), np.nan)
+
+
+def tracking_error_from_returns(stock_returns: np.ndarray, market_returns: np.ndarray, moments=None):
+    # Variance of the active return s - m, expanded so it reuses the paired sums.
+    count, sum_stock, sum_market, sum_stock_sq, sum_market_sq, sum_cross = moments or paired_moments(stock_returns, market_returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sum_active = sum_stock - sum_market
+        sum_active_sq = sum_stock_sq - 2 * sum_cross + sum_market_sq
+        active_var = (sum_active_sq - sum_active ** 2 / count) / (count - 1)
+        return np.where(count > 1, np.sqrt(np.maximum(active_var, 0)) * np.sqrt(TRADING_DAYS), np.nan)
+
+
+def column_prices(data: pd.DataFrame, column: str) -> np.ndarray:
+    prices = data[column]
+    if isinstance(prices, pd.DataFrame):
+        # yfinance returns (field, ticker) columns; a single-ticker download has one.
+        prices = prices.iloc[:, 0]
+    return prices.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class MarketBenchmark:
+    def __init__(self, market_data: pd.DataFrame, column: str = 'Close'):
+        # Market returns are computed once on the market's own calendar;
+        # stocks are placed onto that calendar instead of being joined.
+        self.calendar = market_data.index
+        self.column = column
+        self.returns = returns_from_prices(column_prices(market_data, column))
+
+    def beta(self, stock_data: pd.DataFrame, column: str = None) -> float:
+        returns = returns_from_prices(column_prices(stock_data, column or self.column))
+        return float(beta_from_returns(self.align(stock_data.index, returns), self.returns))
+
+    def alpha(self, stock_data: pd.DataFrame, column: str = None, risk_free_rate: float = 0.0) -> float:
+        returns = returns_from_prices(column_prices(stock_data, column or self.column))
+        beta = beta_from_returns(self.align(stock_data.index, returns), self.returns)
+        return float(alpha_from_returns(returns, self.returns, beta, risk_free_rate))
+
+    def correlation(self, stock_data: pd.DataFrame, column: str = None) -> float:
+        returns = returns_from_prices(column_prices(stock_data, column or self.column))
+        return float(correlation_from_returns(self.align(stock_data.index, returns), self.returns))
+
+    def tracking_error(self, stock_data: pd.DataFrame, column: str = None) -> float:
+        returns = returns_from_prices(column_prices(stock_data, column or self.column))
+        return float(tracking_error_from_returns(self.align(stock_data.index, returns), self.returns))
+
+    def analyze(self, prices: pd.DataFrame, risk_free_rate: float = 0.0) -> pd.DataFrame:
+        returns = returns_from_prices(prices.to_numpy(dtype=np.float64, na_value=np.nan))
+        aligned = self.align(prices.index, returns)
+        moments = paired_moments(aligned, self.returns)
+        beta = beta_from_returns(aligned, self.returns, moments)
+        return pd.DataFrame({
+            'beta': beta,
+            'alpha': alpha_from_returns(returns, self.returns, beta, risk_free_rate),
+            'correlation': correlation_from_returns(aligned, self.returns, moments),
+            'tracking_error': tracking_error_from_returns(aligned, self.returns, moments),
+        }, index=prices.columns)
+
+    def align(self, index: pd.Index, returns: np.ndarray) -> np.ndarray:
+        if index is self.calendar or index.equals(self.calendar):
+            return returns
+        positions = self.calendar.get_indexer(index)
+        found = positions >= 0
+        aligned = np.full((len(self.calendar),) + returns.shape[1:], np.nan)
+        aligned[positions[found]] = returns[found]
+        return aligned
+
 
 class DataAnalyzer:
+    def compute_all(self, data: pd.DataFrame, column: str, periods_per_year: int = TRADING_DAYS,
+                    risk_free_rate: float = 0.0, market_data: pd.DataFrame = None) -> AnalysisResult:
+        prices = self._prices(data, column)
+        returns = returns_from_prices(prices)
+
+        beta = alpha = np.nan
+        if market_data is not None:
+            beta, alpha = self._beta_alpha(data, market_data, column, returns, risk_free_rate)
+
+        variance = float(nan_var(prices))
+        return AnalysisResult(
+            mean=float(nan_mean(prices)),
+            median=float(nan_median(prices)),
+            std=float(np.sqrt(variance)),
+            variance=variance,
+            cagr=float(cagr_from_prices(prices, periods_per_year)),
+            volatility=float(volatility_from_returns(returns)),
+            sharpe_ratio=float(sharpe_from_returns(returns, risk_free_rate)),
+            max_drawdown=float(max_drawdown_from_returns(returns)),
+            beta=beta,
+            alpha=alpha,
+        )
+
     def calculate_mean(self, data: pd.DataFrame, column: str) -> float:
-        return data[column].mean()
+        return float(nan_mean(self._prices(data, column)))
 
     def calculate_median(self, data: pd.DataFrame, column: str) -> float:
-        return data[column].median()
+        return float(nan_median(self._prices(data, column)))
 
     def calculate_std(self, data: pd.DataFrame, column: str) -> float:
-        return data[column].std()
+        return float(np.sqrt(nan_var(self._prices(data, column))))
 
     def calculate_variance(self, data: pd.DataFrame, column: str) -> float:
-        return data[column].var()
+        return float(nan_var(self._prices(data, column)))
 
     def calculate_cagr(self, data: pd.DataFrame, column: str, periods_per_year: int) -> float:
-        end_value = data[column].iloc[-1]
-        start_value = data[column].iloc[0]
-        n_periods = len(data) / periods_per_year
-        return (end_value / start_value) ** (1 / n_periods) - 1
+        return float(cagr_from_prices(self._prices(data, column), periods_per_year))
 
     def calculate_daily_return(self, data: pd.DataFrame, column: str) -> pd.Series:
-        return data[column].pct_change()
+        return pd.Series(returns_from_prices(self._prices(data, column)), index=data.index, name=column)
 
     def calculate_annualized_volatility(self, data: pd.DataFrame, column: str) -> float:
-        daily_returns = self.calculate_daily_return(data, column)
-        return daily_returns.std() * np.sqrt(252)
+        return float(volatility_from_returns(returns_from_prices(self._prices(data, column))))
 
     def calculate_sharpe_ratio(self, data: pd.DataFrame, column: str, risk_free_rate: float = 0.0) -> float:
-        daily_return = self.calculate_daily_return(data, column)
-        excess_return = daily_return - risk_free_rate / 252
-        sharpe_ratio = excess_return.mean() / excess_return.std() * np.sqrt(252)
-        return sharpe_ratio
+        return float(sharpe_from_returns(returns_from_prices(self._prices(data, column)), risk_free_rate))
 
     def calculate_beta(self, stock_data, market_data, column):
-        stock_return = stock_data[column].pct_change().dropna()
-        market_return = market_data[column].pct_change().dropna()
-        
-        merged_data = pd.concat([stock_return, market_return], axis=1, join='inner')
-        stock_return = merged_data.iloc[:, 0]
-        market_return = merged_data.iloc[:, 1]
-
-        covariance = np.cov(stock_return, market_return)[0, 1]
-        beta = covariance / np.var(market_return)
-        return beta
+        if isinstance(market_data, MarketBenchmark):
+            return market_data.beta(stock_data, column)
+        returns = returns_from_prices(self._prices(stock_data, column))
+        market_returns = returns_from_prices(self._prices(market_data, column))
+        stock_returns, market_returns = self._align(stock_data, market_data, returns, market_returns)
+        return float(beta_from_returns(stock_returns, market_returns))
 
     def calculate_alpha(self, stock_data: pd.DataFrame, market_data: pd.DataFrame, column: str, risk_free_rate: float = 0.0) -> float:
-        beta = self.calculate_beta(stock_data, market_data, column)
-        stock_return = stock_data[column].pct_change().mean() * 252
-        market_return = market_data.mean() * 252
-        alpha = stock_return - (risk_free_rate + beta * (market_return - risk_free_rate))
-        return alpha
+        # Only returns, beta and alpha are needed, not the whole compute_all.
+        returns = returns_from_prices(self._prices(stock_data, column))
+        return self._beta_alpha(stock_data, market_data, column, returns, risk_free_rate)[1]
 
     def calculate_max_drawdown(self, data: pd.DataFrame, column: str) -> float:
-        cumulative_return = (1 + data[column].pct_change()).cumprod()
-        peak = cumulative_return.cummax()
-        drawdown = (cumulative_return - peak) / peak
-        max_drawdown = drawdown.min()
-        return max_drawdown
+        return float(max_drawdown_from_returns(returns_from_prices(self._prices(data, column))))
+
+    def _prices(self, data: pd.DataFrame, column: str) -> np.ndarray:
+        return column_prices(data, column)
+
+    def _beta_alpha(self, stock_data, market_data, column, returns, risk_free_rate):
+        if isinstance(market_data, MarketBenchmark):
+            beta = float(beta_from_returns(market_data.align(stock_data.index, returns), market_data.returns))
+            return beta, float(alpha_from_returns(returns, market_data.returns, beta, risk_free_rate))
+        market_returns = returns_from_prices(self._prices(market_data, column))
+        stock_returns, aligned_market_returns = self._align(stock_data, market_data, returns, market_returns)
+        beta = float(beta_from_returns(stock_returns, aligned_market_returns))
+        return beta, float(alpha_from_returns(returns, market_returns, beta, risk_free_rate))
+
+    def _align(self, stock_data, market_data, stock_returns, market_returns):
+        if stock_data.index.equals(market_data.index):
+            return stock_returns, market_returns
+        if isinstance(stock_data, TimeSeries) and isinstance(market_data, TimeSeries):
+            stock_pos, market_pos = stock_data.intersect(market_data)
+            return stock_returns[stock_pos], market_returns[market_pos]
+        _, stock_pos, market_pos = stock_data.index.join(market_data.index, how='inner', return_indexers=True)
+        if stock_pos is not None:
+            stock_returns = stock_returns[stock_pos]
+        if market_pos is not None:
+            market_returns = market_returns[market_pos]
+        return stock_returns, market_returns
@@ -0,0 +1,101 @@
+import queue
+import threading
+
+
+class TaskScheduler:
+    def __init__(self, root, workers: int = 4, poll_ms: int = 50, on_change=None):
+        self.root = root
+        self.poll_ms = poll_ms
+        self.on_change = on_change
+        # Daemon workers rather than a ThreadPoolExecutor, whose threads are
+        # joined at exit: closing the window must not wait on a slow download.
+        self.jobs = queue.Queue()
+        self.workers = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for worker in self.workers:
+            worker.start()
+        self.results = queue.Queue()
+        self.tasks = {}
+        self.lock = threading.Lock()
+        self.polling = False
+
+    def submit(self, key, function, on_done, on_error=None) -> bool:
+        # A task already in flight under the same key just gains another
+        # callback, so e.g. a double-clicked Beta button downloads once.
+        with self.lock:
+            task = self.tasks.get(key)
+            if task is not None:
+                task['callbacks'].append((on_done, on_error))
+                return False
+            task = {'callbacks': [(on_done, on_error)], 'cancelled': threading.Event()}
+            self.tasks[key] = task
+            self.jobs.put((key, function, task['cancelled']))
+        self._changed()
+        self._schedule_poll()
+        return True
+
+    def cancel(self, key=None):
+        with self.lock:
+            keys = list(self.tasks) if key is None else [key]
+            for key in keys:
+                task = self.tasks.pop(key, None)
+                if task is not None:
+                    task['cancelled'].set()
+        self._changed()
+
+    def pending(self) -> int:
+        with self.lock:
+            return len(self.tasks)
+
+    def shutdown(self, wait: bool = False):
+        self.cancel()
+        for _ in self.workers:
+            self.jobs.put(None)
+        if wait:
+            for worker in self.workers:
+                worker.join()
+
+    def poll(self):
+        # Runs on the Tk thread; workers only ever touch the queue.
+        self.polling = False
+        while True:
+            try:
+                key, cancelled, result, error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            with self.lock:
+                task = self.tasks.get(key)
+                if task is None or task['cancelled'] is not cancelled:
+                    continue
+                del self.tasks[key]
+            for on_done, on_error in task['callbacks']:
+                if error is None:
+                    on_done(result)
+                elif on_error is not None:
+                    on_error(error)
+            self._changed()
+        if self.pending():
+            self._schedule_poll()
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            self._run(*job)
+
+    def _run(self, key, function, cancelled):
+        if cancelled.is_set():
+            return
+        try:
+            self.results.put((key, cancelled, function(), None))
+        except Exception as e:
+            self.results.put((key, cancelled, None, e))
+
+    def _schedule_poll(self):
+        if not self.polling:
+            self.polling = True
+            self.root.after(self.poll_ms, self.poll)
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change(self.pending())
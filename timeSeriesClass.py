@@ -0,0 +1,100 @@
+import pandas as pd
+import numpy as np
+from dataLoaderClass import DATE_COLUMN
+
+
+class TimeSeries:
+    def __init__(self, data, keep: str = 'last'):
+        # Guarantees a sorted, duplicate-free DatetimeIndex; data that already
+        # has one is wrapped without a copy.
+        if isinstance(data, TimeSeries):
+            data = data.frame
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        if not isinstance(data.index, pd.DatetimeIndex):
+            if DATE_COLUMN in data.columns:
+                data = data.set_index(DATE_COLUMN)
+            data = data.set_axis(pd.DatetimeIndex(pd.to_datetime(data.index), name=data.index.name), axis=0)
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index(kind='stable')
+        if not data.index.is_unique:
+            data = data[~data.index.duplicated(keep=keep)]
+        self.frame = data
+
+    @classmethod
+    def _wrap(cls, frame):
+        series = cls.__new__(cls)
+        series.frame = frame
+        return series
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return self.frame.index
+
+    @property
+    def columns(self) -> pd.Index:
+        return self.frame.columns
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.frame.index.values
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, column):
+        return column in self.frame
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.slice(key.start, key.stop)
+        return self.frame[key]
+
+    def to_frame(self) -> pd.DataFrame:
+        return self.frame
+
+    def slice(self, start=None, end=None) -> 'TimeSeries':
+        # Binary search on the sorted index, end inclusive like .loc; the
+        # positional slice is a view of the same blocks.
+        lo, hi = self.positions(start, end)
+        return self._wrap(self.frame.iloc[lo:hi])
+
+    def positions(self, start=None, end=None):
+        index = self.frame.index
+        lo = 0 if start is None else int(index.searchsorted(pd.Timestamp(start), side='left'))
+        hi = len(index) if end is None else int(index.searchsorted(pd.Timestamp(end), side='right'))
+        return lo, max(lo, hi)
+
+    def asof_positions(self, times, tolerance=None) -> np.ndarray:
+        # Row of the last observation at or before each time, -1 if none
+        # (or if it is older than tolerance).
+        times = pd.DatetimeIndex(times)
+        positions = self.frame.index.searchsorted(times, side='right') - 1
+        if tolerance is not None and len(self.frame):
+            stale = times - self.frame.index[np.maximum(positions, 0)] > pd.Timedelta(tolerance)
+            positions = np.where(stale, -1, positions)
+        return positions
+
+    def asof_join(self, other: 'TimeSeries', columns=None, tolerance=None, suffix: str = '_other') -> 'TimeSeries':
+        # Each row gets the latest row of other at or before its timestamp,
+        # e.g. daily market closes onto intraday stock bars.
+        other = other if isinstance(other, TimeSeries) else TimeSeries(other)
+        positions = other.asof_positions(self.frame.index, tolerance)
+        found = positions >= 0
+        joined = {}
+        for column in (other.columns if columns is None else columns):
+            values = other.frame[column].to_numpy()
+            if not found.all() and values.dtype.kind in 'biu':
+                values = values.astype(np.float64)
+            taken = values[np.maximum(positions, 0)] if len(values) else np.full(len(positions), np.nan)
+            if not found.all():
+                taken = np.where(found, taken, np.nan)
+            joined[f'{column}{suffix}' if column in self.frame.columns else column] = taken
+        return self._wrap(self.frame.assign(**joined))
+
+    def intersect(self, other: 'TimeSeries'):
+        # Row positions of the timestamps both series share, by binary search
+        # instead of a hash join.
+        positions = np.minimum(other.frame.index.searchsorted(self.frame.index), max(len(other) - 1, 0))
+        matched = np.flatnonzero(other.times[positions] == self.times) if len(other) else np.empty(0, dtype=np.int64)
+        return matched, positions[matched]
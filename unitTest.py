@@ -1,20 +1,53 @@
+import functools
+import os
+import subprocess
+import sys
+import tempfile
+import threading
 import unittest
 import pandas as pd
 import numpy as np
 from dataLoaderClass import DataLoader
-from statisticalAnalysisClass import DataAnalyzer
+from exporterClass import Exporter
+from statisticalAnalysisClass import DataAnalyzer, MarketBenchmark
 from visualizationClass import DataVisualizer
+from batchAnalysisClass import BatchAnalyzer
+from parallelRunnerClass import ParallelRunner
+from priceCacheClass import PriceCache
+from onlineAnalysisClass import OnlineAnalyzer
+from indicatorClass import IndicatorEngine
+from benchmark import Benchmark, compare, import_time, ENTRY_POINTS
+from taskSchedulerClass import TaskScheduler
+from app2 import BatchApp
+from rollingAnalysisClass import RollingAnalyzer
+from downsamplingClass import Downsampler
+from chartBookClass import ChartBook
+from portfolioAnalysisClass import PortfolioAnalyzer
+from monteCarloClass import MonteCarloSimulator
+from backtestClass import Backtester
+from parameterSweepClass import ParameterSweep, SweepIndicators
+from resamplingClass import OHLCVPyramid, Resampler
+from timeSeriesClass import TimeSeries
+from correlationClass import CorrelationMatrix
 
+FIXTURE_DIR = tempfile.TemporaryDirectory()
+TEST_DATA = os.path.join(FIXTURE_DIR.name, 'test_data.csv')
 
-data = pd.DataFrame({
-    'Date': pd.date_range(start='1/1/2022', periods=100, freq='D'),
-    'Close': np.random.randn(100).cumsum() + 100,
-    'Open': np.random.randn(100).cumsum() + 100,
-    'High': np.random.randn(100).cumsum() + 100,
-    'Low': np.random.randn(100).cumsum() + 100,
-    'Volume': np.random.randint(1, 1000, size=100)
-})
-data.to_csv('test_data.csv', index=False)
+
+def setUpModule():
+    data = pd.DataFrame({
+        'Date': pd.date_range(start='1/1/2022', periods=100, freq='D'),
+        'Close': np.random.randn(100).cumsum() + 100,
+        'Open': np.random.randn(100).cumsum() + 100,
+        'High': np.random.randn(100).cumsum() + 100,
+        'Low': np.random.randn(100).cumsum() + 100,
+        'Volume': np.random.randint(1, 1000, size=100)
+    })
+    data.to_csv(TEST_DATA, index=False)
+
+
+def tearDownModule():
+    FIXTURE_DIR.cleanup()
 
 
 class TestDataLoader(unittest.TestCase):
@@ -23,8 +56,34 @@ class TestDataLoader(unittest.TestCase):
         self.data_loader = DataLoader()
     
     def test_load_csv(self):
-        data = self.data_loader.load_csv('test_data.csv')
+        data = self.data_loader.load_csv(TEST_DATA)
         self.assertIsInstance(data, pd.DataFrame)
+        self.assertIsInstance(data.index, pd.DatetimeIndex)
+        self.assertEqual(data['Close'].dtype, np.float64)
+        self.assertEqual(data['Volume'].dtype, np.int64)
+
+    def test_load_csv_float_and_blank_volume(self):
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'volume.csv')
+            with open(file_path, 'w') as file:
+                file.write('Date,Close,Volume\n2024-01-02,1.5,100.0\n2024-01-03,1.6,\n')
+            data = self.data_loader.load_csv(file_path)
+        self.assertEqual(data['Volume'].dtype, np.float64)
+        self.assertEqual(data['Volume'].iloc[0], 100)
+        self.assertTrue(np.isnan(data['Volume'].iloc[1]))
+
+    def test_csv_round_trip(self):
+        data = self.data_loader.load_csv(TEST_DATA)
+        with tempfile.TemporaryDirectory() as dir_path:
+            file_path = os.path.join(dir_path, 'copy.csv')
+            Exporter(data).export_to_csv(file_path)
+            pd.testing.assert_frame_equal(self.data_loader.load_csv(file_path), data)
+
+    def test_iter_csv(self):
+        batches = list(self.data_loader.iter_csv(TEST_DATA, chunksize=30, price_dtype=np.float32))
+        self.assertEqual([len(batch) for batch in batches], [30, 30, 30, 10])
+        self.assertEqual(batches[0]['Close'].dtype, np.float32)
+        self.assertIsInstance(batches[-1].index, pd.DatetimeIndex)
 
         
     def test_load_yfinance(self):
@@ -32,6 +91,81 @@ class TestDataLoader(unittest.TestCase):
         self.assertIsInstance(data, pd.DataFrame)
         self.assertIn('Close', data.columns)
 
+    def test_load_many(self):
+        attempts = []
+
+        def fake_fetch(ticker, start, end):
+            attempts.append(ticker)
+            if ticker == 'BAD':
+                raise ConnectionError("unreachable")
+            if ticker == 'FLAKY' and attempts.count('FLAKY') == 1:
+                raise TimeoutError("timed out")
+            dates = pd.date_range(start, end, inclusive='left')
+            return pd.DataFrame({'Close': np.arange(len(dates), dtype=float)}, index=dates)
+
+        data_loader = DataLoader(fetch=fake_fetch)
+        panel = data_loader.load_many(['AAPL', 'FLAKY', 'BAD'], '2022-01-01', '2022-01-11',
+                                      max_per_second=0, retries=2, backoff=0)
+        self.assertEqual(list(panel.columns), ['AAPL', 'FLAKY'])
+        self.assertEqual(len(panel), 10)
+        self.assertEqual(list(data_loader.failures), ['BAD'])
+        self.assertEqual(attempts.count('BAD'), 3)
+
+class TestExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.store_dir = tempfile.TemporaryDirectory()
+        self.data = DataLoader().load_csv(TEST_DATA)
+
+    def tearDown(self):
+        self.store_dir.cleanup()
+
+    def test_export_to_store(self):
+        Exporter(self.data).export_to_store(self.store_dir.name)
+        loaded = DataLoader().load_store(self.store_dir.name)
+        pd.testing.assert_frame_equal(loaded, self.data)
+
+    def test_load_store_slice(self):
+        Exporter(self.data).export_to_store(self.store_dir.name)
+        loaded = DataLoader().load_store(self.store_dir.name, columns=['Close'], start='2022-02-01', end='2022-02-28')
+        pd.testing.assert_frame_equal(loaded, self.data.loc['2022-02-01':'2022-02-28', ['Close']])
+
+    def test_export_to_parquet_and_feather(self):
+        parquet = os.path.join(self.store_dir.name, 'data.parquet')
+        feather = os.path.join(self.store_dir.name, 'data.feather')
+        Exporter(self.data).export_to_parquet(parquet, compression='zstd')
+        Exporter(self.data).export_to_feather(feather)
+        pd.testing.assert_frame_equal(pd.read_parquet(parquet), self.data)
+        pd.testing.assert_frame_equal(pd.read_feather(feather), self.data)
+
+    def test_streaming_batches(self):
+        batches = (self.data.iloc[start:start + 7] for start in range(0, len(self.data), 7))
+        parquet = os.path.join(self.store_dir.name, 'data.parquet')
+        Exporter(batches).export_to_parquet(parquet)
+        pd.testing.assert_frame_equal(pd.read_parquet(parquet), self.data)
+
+    def test_append(self):
+        csv = os.path.join(self.store_dir.name, 'data.csv')
+        dataset = os.path.join(self.store_dir.name, 'dataset')
+        Exporter(self.data.iloc[:10]).export_to_csv(csv, append=True)
+        Exporter(self.data.iloc[10:]).export_to_csv(csv, append=True)
+        Exporter(self.data.iloc[:10]).export_to_parquet(dataset, append=True)
+        Exporter(self.data.iloc[10:]).export_to_parquet(dataset, append=True)
+        pd.testing.assert_frame_equal(DataLoader().load_csv(csv), self.data)
+        pd.testing.assert_frame_equal(pd.read_parquet(dataset), self.data)
+
+    def test_streamed_csv_keeps_dates(self):
+        csv = os.path.join(self.store_dir.name, 'data.csv')
+        Exporter(DataLoader().iter_csv(TEST_DATA, chunksize=30)).export_to_csv(csv)
+        pd.testing.assert_frame_equal(DataLoader().load_csv(csv), self.data)
+
+    def test_streamed_store(self):
+        Exporter(DataLoader().iter_csv(TEST_DATA, chunksize=30)).export_to_store(self.store_dir.name)
+        store = DataLoader().load_store(self.store_dir.name)
+        # iter_csv keeps Volume as float64 across batches.
+        pd.testing.assert_frame_equal(store, self.data.astype({'Volume': np.float64}), check_freq=False)
+        self.assertEqual(len(store.loc[self.data.index[40]:self.data.index[70]]), 31)
+
 class TestDataAnalyzer(unittest.TestCase):
 
     def setUp(self):
@@ -84,6 +218,557 @@ class TestDataAnalyzer(unittest.TestCase):
         max_drawdown = self.data_analyzer.calculate_max_drawdown(self.data, 'Close')
         self.assertIsInstance(max_drawdown, float)
 
+    def test_calculate_alpha(self):
+        alpha = self.data_analyzer.calculate_alpha(self.data, self.market_data, 'Close')
+        self.assertIsInstance(alpha, float)
+
+    def test_compute_all(self):
+        result = self.data_analyzer.compute_all(self.data, 'Close', 252, market_data=self.market_data)
+        daily_return = self.data['Close'].pct_change()
+        self.assertAlmostEqual(result.mean, self.data['Close'].mean())
+        self.assertAlmostEqual(result.std, self.data['Close'].std())
+        self.assertAlmostEqual(result.volatility, daily_return.std() * np.sqrt(252))
+        self.assertAlmostEqual(result.sharpe_ratio, self.data_analyzer.calculate_sharpe_ratio(self.data, 'Close'))
+        self.assertAlmostEqual(result.max_drawdown, self.data_analyzer.calculate_max_drawdown(self.data, 'Close'))
+        self.assertAlmostEqual(result.beta, self.data_analyzer.calculate_beta(self.data, self.market_data, 'Close'))
+
+class TestBatchAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.batch_analyzer = BatchAnalyzer()
+        self.data_analyzer = DataAnalyzer()
+        self.prices = pd.DataFrame({
+            'AAA': np.random.randn(100).cumsum() + 100,
+            'BBB': np.random.randn(100).cumsum() + 100,
+            'Market': np.random.randn(100).cumsum() + 100
+        })
+        self.prices.loc[:9, 'BBB'] = np.nan
+
+    def test_analyze_matches_data_analyzer(self):
+        results = self.batch_analyzer.analyze(self.prices, market='Market')
+        self.assertEqual(list(results.index), ['AAA', 'BBB'])
+        market_data = self.prices[['Market']].rename(columns={'Market': 'Close'})
+        for ticker in ['AAA', 'BBB']:
+            stock_data = self.prices[[ticker]].rename(columns={ticker: 'Close'}).dropna()
+            expected = self.data_analyzer.compute_all(stock_data, 'Close', market_data=market_data)
+            np.testing.assert_allclose(results.loc[ticker].to_numpy(), np.array(expected))
+
+    def test_analyze_ndarray(self):
+        results = self.batch_analyzer.analyze(self.prices[['AAA', 'BBB']].to_numpy())
+        self.assertEqual(results.shape, (2, 10))
+        self.assertTrue(results['beta'].isna().all())
+
+class TestParallelRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.parallel_runner = ParallelRunner(workers=2, chunk_size=2)
+        self.prices = pd.DataFrame({
+            ticker: np.random.randn(100).cumsum() + 100 for ticker in ['AAA', 'BBB', 'CCC', 'Market']
+        })
+
+    def test_run(self):
+        results = self.parallel_runner.run(self.prices, market='Market')
+        expected = BatchAnalyzer().analyze(self.prices, market='Market')
+        np.testing.assert_allclose(results.loc[expected.index].to_numpy(), expected.to_numpy())
+        self.assertEqual(self.parallel_runner.throughput['tickers'].sum(), 3)
+
+    def test_run_tickers_reports_failures(self):
+        def fake_fetch(ticker, start, end):
+            if ticker == 'BAD':
+                raise ConnectionError("unreachable")
+            return self.prices[[ticker]].rename(columns={ticker: 'Close'})
+
+        data_loader = DataLoader(fetch=fake_fetch)
+        data_loader.load_many = functools.partial(data_loader.load_many, max_per_second=0, backoff=0)
+        self.parallel_runner.data_loader = data_loader
+        results = self.parallel_runner.run_tickers(['AAA', 'BAD'], None, None, market_ticker='Market')
+        self.assertEqual(list(results.index), ['AAA'])
+        self.assertEqual(self.parallel_runner.failures, {'BAD': 'unreachable'})
+
+class TestPriceCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.requests = []
+        self.now = pd.Timestamp('2024-06-28').timestamp()
+        self.price_cache = PriceCache(self.cache_dir.name, download=self.fake_download, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def fake_download(self, ticker, start, end):
+        self.requests.append((start, end))
+        dates = pd.date_range(start, end, inclusive='left')
+        return pd.DataFrame({'Close': np.arange(len(dates), dtype=float) + 100}, index=dates)
+
+    def test_fetches_only_missing_gaps(self):
+        self.price_cache.get('AAPL', '2024-01-01', '2024-02-01')
+        data = self.price_cache.get('AAPL', '2024-01-15', '2024-03-01')
+        self.assertEqual(self.requests, [('2024-01-01', '2024-02-01'), ('2024-02-01', '2024-03-01')])
+        self.assertEqual(data.index[0], pd.Timestamp('2024-01-15'))
+        self.assertEqual(data.index[-1], pd.Timestamp('2024-02-29'))
+
+    def test_persists_between_instances(self):
+        self.price_cache.get('^GSPC', '2024-01-01', '2024-02-01')
+        reopened = PriceCache(self.cache_dir.name, download=self.fake_download)
+        data = reopened.get('^GSPC', '2024-01-10', '2024-01-20')
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(len(data), 10)
+
+    def test_recent_bars_expire(self):
+        self.price_cache.get('AAPL', '2024-06-01', '2024-06-29')
+        self.now += self.price_cache.ttl_seconds + 1
+        self.price_cache.get('AAPL', '2024-06-01', '2024-06-29')
+        self.assertEqual(self.requests[1], ('2024-06-25', '2024-06-29'))
+
+    def test_failed_fetch_is_not_cached(self):
+        download = self.price_cache.download
+        self.price_cache.download = lambda ticker, start, end: pd.DataFrame()
+        self.assertTrue(self.price_cache.get('AAPL', '2024-01-01', '2024-02-01').empty)
+        self.price_cache.download = download
+        data = self.price_cache.get('AAPL', '2024-01-01', '2024-02-01')
+        self.assertEqual(len(data), 31)
+        self.assertEqual(self.requests, [('2024-01-01', '2024-02-01')])
+
+    def test_tickers_download_concurrently(self):
+        started = threading.Barrier(2, timeout=5)
+
+        def slow_download(ticker, start, end):
+            started.wait()
+            return self.fake_download(ticker, start, end)
+
+        self.price_cache.download = slow_download
+        data_loader = DataLoader(cache=self.price_cache)
+        panel = data_loader.load_many(['AAPL', 'MSFT'], '2024-01-01', '2024-02-01', workers=2, retries=0)
+        self.assertEqual(list(panel.columns), ['AAPL', 'MSFT'])
+        self.assertEqual(sorted(self.price_cache.index), ['AAPL', 'MSFT'])
+
+    def test_hits_leave_index_untouched(self):
+        self.price_cache.get('AAPL', '2024-01-01', '2024-02-01')
+        self.price_cache.get('MSFT', '2024-01-01', '2024-02-01')
+        written = os.stat(self.price_cache.index_path).st_mtime_ns
+        os.utime(self.price_cache.index_path, ns=(written - 10 ** 9, written - 10 ** 9))
+        self.price_cache.get('AAPL', '2024-01-10', '2024-01-20')
+        self.assertEqual(os.stat(self.price_cache.index_path).st_mtime_ns, written - 10 ** 9)
+        sizes = [os.path.getsize(self.price_cache._data_path(ticker)) for ticker in ('AAPL', 'MSFT')]
+        self.assertEqual(self.price_cache.total_bytes, sum(sizes))
+
+    def test_evicts_least_recently_used(self):
+        self.price_cache.max_bytes = 1
+        self.price_cache.get('AAPL', '2024-01-01', '2024-02-01')
+        self.price_cache.get('MSFT', '2024-01-01', '2024-02-01')
+        self.assertEqual(list(self.price_cache.index), ['MSFT'])
+
+class TestOnlineAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'Close': np.random.randn(200).cumsum() + 200
+        })
+        self.online_analyzer = OnlineAnalyzer(risk_free_rate=0.02)
+
+    def test_matches_batch_methods(self):
+        self.online_analyzer.update_batch(self.data['Close'])
+        data_analyzer = DataAnalyzer()
+        self.assertAlmostEqual(self.online_analyzer.mean, data_analyzer.calculate_mean(self.data, 'Close'))
+        self.assertAlmostEqual(self.online_analyzer.std, data_analyzer.calculate_std(self.data, 'Close'))
+        self.assertAlmostEqual(self.online_analyzer.sharpe_ratio, data_analyzer.calculate_sharpe_ratio(self.data, 'Close', 0.02))
+        self.assertAlmostEqual(self.online_analyzer.max_drawdown, data_analyzer.calculate_max_drawdown(self.data, 'Close'))
+        close = self.data['Close']
+        macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        self.assertAlmostEqual(self.online_analyzer.macd, macd.iloc[-1])
+        self.assertAlmostEqual(self.online_analyzer.signal_line, macd.ewm(span=9, adjust=False).mean().iloc[-1])
+        delta = close.diff(1)
+        rs = delta.mask(delta < 0, 0).rolling(14).mean() / (-delta.mask(delta > 0, 0)).rolling(14).mean()
+        self.assertAlmostEqual(self.online_analyzer.rsi, 100 - 100 / (1 + rs.iloc[-1]))
+
+    def test_rsi_after_flat_stretch(self):
+        self.online_analyzer.update_batch(np.random.randn(5000).cumsum() * 3 + 1000)
+        self.online_analyzer.update_batch([500.0] * 15)
+        self.assertTrue(np.isnan(self.online_analyzer.rsi))
+        self.online_analyzer.update(501.0)
+        self.assertEqual(self.online_analyzer.rsi, 100.0)
+
+    def test_snapshot_restore(self):
+        self.online_analyzer.update_batch(self.data['Close'][:120])
+        restored = OnlineAnalyzer.restore(self.online_analyzer.snapshot())
+        self.online_analyzer.update_batch(self.data['Close'][120:])
+        restored.update_batch(self.data['Close'][120:])
+        self.assertEqual(restored.snapshot(), self.online_analyzer.snapshot())
+
+    def test_streamed_csv_batches(self):
+        for batch in DataLoader().iter_csv(TEST_DATA, chunksize=25):
+            self.online_analyzer.update_batch(batch['Close'])
+        self.assertAlmostEqual(self.online_analyzer.mean, pd.read_csv(TEST_DATA)['Close'].mean())
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.indicator_engine = IndicatorEngine()
+        self.data = pd.DataFrame({
+            'Close': np.random.randn(100).cumsum() + 100
+        })
+
+    def test_bollinger_bands(self):
+        sma, upper_band, lower_band = self.indicator_engine.bollinger_bands(self.data['Close'], 20)
+        rolling = self.data['Close'].rolling(window=20)
+        np.testing.assert_allclose(sma, rolling.mean())
+        np.testing.assert_allclose(upper_band, rolling.mean() + rolling.std() * 2)
+        np.testing.assert_allclose(lower_band, rolling.mean() - rolling.std() * 2)
+        self.assertEqual(list(self.data.columns), ['Close'])
+
+    def test_macd(self):
+        macd, signal_line = self.indicator_engine.macd(self.data['Close'])
+        close = self.data['Close']
+        expected = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        np.testing.assert_allclose(macd, expected)
+        np.testing.assert_allclose(signal_line, expected.ewm(span=9, adjust=False).mean())
+
+    def test_panel_matches_columns(self):
+        panel = pd.DataFrame(np.random.randn(100, 3).cumsum(axis=0) + 100, columns=['A', 'B', 'C'])
+        macd, signal_line = self.indicator_engine.macd(panel)
+        rsi = self.indicator_engine.rsi(panel)
+        for position, column in enumerate(panel.columns):
+            column_macd, column_signal = IndicatorEngine().macd(panel[column])
+            np.testing.assert_allclose(macd[:, position], column_macd)
+            np.testing.assert_allclose(signal_line[:, position], column_signal)
+            np.testing.assert_allclose(rsi[:, position], IndicatorEngine().rsi(panel[column]))
+
+    def test_reuses_shared_intermediates(self):
+        self.indicator_engine.sma(self.data['Close'], 20)
+        self.indicator_engine.bollinger_bands(self.data['Close'], 20)
+        self.assertEqual(self.indicator_engine.hits, 1)
+        self.indicator_engine.sma(self.data.copy()['Close'], 20)
+        self.assertEqual(self.indicator_engine.hits, 1)
+
+    def test_in_place_edit_invalidates(self):
+        self.indicator_engine.sma(self.data['Close'], 5)
+        self.data.loc[99, 'Close'] = 1000.0
+        np.testing.assert_allclose(self.indicator_engine.sma(self.data['Close'], 5),
+                                   self.data['Close'].rolling(5).mean())
+        self.assertEqual(self.indicator_engine.hits, 0)
+
+    def test_float32_input_hits(self):
+        close = self.data['Close'].astype(np.float32)
+        self.indicator_engine.rsi(close)
+        self.indicator_engine.rsi(close)
+        self.assertEqual(self.indicator_engine.hits, 1)
+        self.assertEqual(len(self.indicator_engine.cache), 1)
+
+    def test_eviction(self):
+        self.indicator_engine.max_entries = 2
+        for window in [5, 10, 20]:
+            self.indicator_engine.sma(self.data['Close'], window)
+        self.assertEqual(len(self.indicator_engine.cache), 2)
+
+class TestPortfolioAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = pd.DataFrame(np.random.randn(300, 4).cumsum(axis=0) + 200, columns=['A', 'B', 'C', 'D'],
+                                   index=pd.date_range(start='2022-01-03', periods=300, freq='B'))
+        self.portfolio_analyzer = PortfolioAnalyzer(self.prices)
+
+    def test_single_asset_matches_data_analyzer(self):
+        result = self.portfolio_analyzer.analyze(pd.Series({'B': 1.0}, name='B'))
+        data_analyzer = DataAnalyzer()
+        self.assertAlmostEqual(result.loc['B', 'volatility'], data_analyzer.calculate_annualized_volatility(self.prices, 'B'))
+        self.assertAlmostEqual(result.loc['B', 'sharpe_ratio'], data_analyzer.calculate_sharpe_ratio(self.prices, 'B'))
+        self.assertAlmostEqual(result.loc['B', 'max_drawdown'], data_analyzer.calculate_max_drawdown(self.prices, 'B'))
+        self.assertAlmostEqual(result.loc['B', 'cagr'], data_analyzer.calculate_cagr(self.prices, 'B', 252))
+
+    def test_covariance_matches_path(self):
+        weights = np.random.dirichlet(np.ones(4), 5)
+        values = self.portfolio_analyzer.values(weights).to_numpy()
+        returns = values[1:] / values[:-1] - 1
+        np.testing.assert_allclose(self.portfolio_analyzer.volatility(weights), returns.std(axis=0, ddof=1) * np.sqrt(252))
+        np.testing.assert_allclose(values[1:] / values[:-1] - 1,
+                                   self.portfolio_analyzer.returns @ weights.T, atol=1e-12)
+
+    def test_unallocated_weight_is_cash(self):
+        weights = np.array([[0.5, 0.3, 0.0, 0.0], [1.0, -1.0, 0.0, 0.0]])
+        values = self.portfolio_analyzer.values(weights).to_numpy()
+        np.testing.assert_allclose(values[1:] / values[:-1] - 1, self.portfolio_analyzer.returns @ weights.T,
+                                   atol=1e-12)
+        result = self.portfolio_analyzer.analyze(weights)
+        np.testing.assert_allclose(result['return'], self.portfolio_analyzer.returns.mean(axis=0) @ weights.T * 252)
+        np.testing.assert_allclose(result['volatility'],
+                                   (self.portfolio_analyzer.returns @ weights.T).std(axis=0, ddof=1) * np.sqrt(252))
+
+    def test_rebalancing_lets_weights_drift(self):
+        weights = np.array([0.4, 0.3, 0.2, 0.1])
+        values = self.portfolio_analyzer.values(weights, rebalance='M').iloc[:, 0]
+        holdings, expected = None, [1.0]
+        periods = self.prices.index.to_period('M')
+        for row in range(1, len(self.prices)):
+            if row == 1 or periods[row] != periods[row - 1]:
+                holdings = expected[-1] * weights
+            holdings = holdings * self.prices.iloc[row].to_numpy() / self.prices.iloc[row - 1].to_numpy()
+            expected.append(holdings.sum())
+        np.testing.assert_allclose(values.to_numpy(), expected)
+        result = self.portfolio_analyzer.analyze(np.vstack([weights, weights[::-1]]), rebalance=21, chunk_size=1)
+        self.assertEqual(list(result.index), [0, 1])
+        self.assertFalse(result.isna().any().any())
+
+class TestMonteCarloSimulator(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'Close': 100 * np.exp(np.random.normal(0.0005, 0.01, 500).cumsum())
+        })
+
+    def test_simulate(self):
+        paths = MonteCarloSimulator(seed=1, chunk_size=300).simulate(self.data, 'Close', 60, 1_000, method='bootstrap')
+        self.assertEqual(paths.shape, (61, 1_000))
+        np.testing.assert_allclose(paths[0], self.data['Close'].iloc[-1])
+        again = MonteCarloSimulator(seed=1, chunk_size=300).simulate(self.data, 'Close', 60, 1_000, method='bootstrap')
+        np.testing.assert_array_equal(paths, again)
+
+    def test_gbm_matches_historical_drift(self):
+        paths = MonteCarloSimulator(seed=2).simulate(self.data, 'Close', 1, 20_000, method='gbm')
+        log_returns = np.log(self.data['Close']).diff().dropna()
+        self.assertAlmostEqual(np.log(paths[1] / paths[0]).std(), log_returns.std(), places=3)
+
+    def test_confidence_intervals(self):
+        serial = MonteCarloSimulator(seed=3, chunk_size=250).confidence_intervals(self.data, 'Close', n_paths=1_000)
+        parallel = MonteCarloSimulator(seed=3, chunk_size=250, workers=2).confidence_intervals(
+            self.data, 'Close', n_paths=1_000)
+        pd.testing.assert_frame_equal(serial, parallel)
+        self.assertEqual(list(serial.index), ['sharpe_ratio', 'max_drawdown', 'cagr'])
+        self.assertTrue((serial['lower'] <= serial['upper']).all())
+        self.assertAlmostEqual(serial.loc['cagr', 'estimate'],
+                               DataAnalyzer().calculate_cagr(self.data, 'Close', 252))
+        self.assertTrue(serial.loc['cagr', 'lower'] < serial.loc['cagr', 'estimate'] < serial.loc['cagr', 'upper'])
+
+class TestBacktester(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = pd.DataFrame(np.random.randn(300, 3).cumsum(axis=0) + 200, columns=['A', 'B', 'C'],
+                                   index=pd.date_range(start='2022-01-03', periods=300, freq='B'))
+
+    def test_ma_crossover_equity(self):
+        result = Backtester(cost=0.001).run(self.prices, 'ma_crossover', short_window=10, long_window=30)
+        close = self.prices['B']
+        signal = (close.rolling(10).mean() > close.rolling(30).mean()).astype(float)
+        strategy_returns = signal.shift(1).fillna(0) * close.pct_change() - 0.001 * signal.diff().fillna(signal).abs()
+        np.testing.assert_allclose(result.positions['B'], signal)
+        np.testing.assert_allclose(result.equity['B'], (1 + strategy_returns.fillna(0)).cumprod())
+
+    def test_signals_are_held(self):
+        backtester = Backtester(allow_short=True)
+        rsi = IndicatorEngine().rsi(self.prices['A'])
+        positions = backtester.positions(self.prices, 'rsi')['A'].to_numpy()
+        np.testing.assert_array_equal(positions[rsi < 30], 1.0)
+        np.testing.assert_array_equal(positions[rsi > 70], -1.0)
+        self.assertEqual(positions[0], 0.0)
+        for strategy in ('bollinger', 'macd'):
+            positions = backtester.positions(self.prices, strategy)
+            self.assertTrue(positions.isin([-1.0, 0.0, 1.0]).all().all())
+
+    def test_metrics_match_data_analyzer(self):
+        result = Backtester().run(self.prices, 'macd')
+        data_analyzer = DataAnalyzer()
+        for ticker in self.prices.columns:
+            self.assertAlmostEqual(result.metrics.loc[ticker, 'sharpe_ratio'],
+                                   data_analyzer.calculate_sharpe_ratio(result.equity, ticker))
+            self.assertAlmostEqual(result.metrics.loc[ticker, 'max_drawdown'],
+                                   data_analyzer.calculate_max_drawdown(result.equity, ticker))
+            self.assertAlmostEqual(result.metrics.loc[ticker, 'cagr'],
+                                   data_analyzer.calculate_cagr(result.equity, ticker, 252))
+        self.assertTrue((result.positions >= 0).all().all())
+
+class TestParameterSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = pd.DataFrame(np.random.randn(400, 2).cumsum(axis=0) + 200, columns=['A', 'B'])
+
+    def test_shared_indicators_match_engine(self):
+        sweep_indicators, indicator_engine = SweepIndicators(), IndicatorEngine()
+        for window in (5, 20):
+            np.testing.assert_allclose(sweep_indicators.sma(self.prices, window),
+                                       indicator_engine.sma(self.prices, window), rtol=1e-12)
+            np.testing.assert_allclose(sweep_indicators.rolling_std(self.prices, window),
+                                       indicator_engine.rolling_std(self.prices, window), rtol=1e-9)
+            np.testing.assert_allclose(sweep_indicators.rsi(self.prices, window),
+                                       indicator_engine.rsi(self.prices, window), rtol=1e-9)
+
+    def test_run_matches_backtester(self):
+        grid = {'short_window': [5, 10, 60], 'long_window': [30, 60]}
+        table = ParameterSweep(chunk_size=2, cost=0.001).run(self.prices, 'ma_crossover', grid)
+        self.assertEqual(len(table), 4 * 2)
+        self.assertTrue((table['short_window'] < table['long_window']).all())
+        self.assertTrue(table['sharpe_ratio'].is_monotonic_decreasing)
+        self.assertEqual(sorted(table.loc[table['Ticker'] == 'B', 'rank']), [1, 2, 3, 4])
+        for _, row in table.iterrows():
+            metrics = Backtester(cost=0.001).run(self.prices, 'ma_crossover', short_window=row['short_window'],
+                                                 long_window=row['long_window']).metrics.loc[row['Ticker']]
+            self.assertAlmostEqual(row['sharpe_ratio'], metrics['sharpe_ratio'])
+            self.assertAlmostEqual(row['turnover'], metrics['turnover'])
+
+    def test_chunks_share_prefix_sums(self):
+        sweep = ParameterSweep(chunk_size=2)
+        counted = []
+        prefix = SweepIndicators._prefix
+
+        def counting_prefix(indicators, series, name, transform):
+            return prefix(indicators, series, name, lambda values: counted.append(name) or transform(values))
+
+        SweepIndicators._prefix = counting_prefix
+        try:
+            sweep.run(self.prices, 'rsi', {'window': [7, 14, 21], 'lower': [20, 30], 'upper': [70]})
+        finally:
+            SweepIndicators._prefix = prefix
+        self.assertEqual(sorted(counted), ['gain', 'loss'])
+
+    def test_parallel_chunks(self):
+        serial = ParameterSweep(chunk_size=4).run(self.prices, 'macd')
+        parallel = ParameterSweep(workers=2, chunk_size=4).run(self.prices, 'macd')
+        pd.testing.assert_frame_equal(serial, parallel)
+
+class TestResampler(unittest.TestCase):
+
+    def setUp(self):
+        index = pd.date_range(start='2022-01-03 09:30', periods=3000, freq='min')
+        index = index[(index.hour >= 9) & (index.hour < 16)]
+        close = np.random.randn(len(index)).cumsum() + 100
+        self.data = pd.DataFrame({
+            'Open': close + np.random.randn(len(index)) * 0.1,
+            'High': close + 1,
+            'Low': close - 1,
+            'Close': close,
+            'Volume': np.random.randint(1, 1000, size=len(index))
+        }, index=index.rename('Date'))
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_resample_matches_pandas(self):
+        aggregation = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+        for rule in ('5min', '1h', '1D'):
+            expected = self.data.resample(rule).agg(aggregation).dropna(subset=['Open'])
+            pd.testing.assert_frame_equal(Resampler().resample(self.data, rule), expected, check_freq=False)
+        monthly = Resampler().resample(self.data, 'ME')
+        self.assertEqual(list(monthly.index), [pd.Timestamp('2022-01-01')])
+        self.assertEqual(monthly['Volume'].iloc[0], self.data['Volume'].sum())
+
+    def test_pyramid(self):
+        pyramid = OHLCVPyramid(self.directory.name)
+        pyramid.build(self.data)
+        self.assertEqual(pyramid.stored_levels(), ['5min', '1h', '1D'])
+        pd.testing.assert_frame_equal(pyramid.load(rule='1h'), Resampler().resample(self.data, '1h'), check_freq=False)
+        self.assertEqual(pyramid.select(max_bars=10), '1D')
+        self.assertEqual(pyramid.select('2022-01-04 10:00', '2022-01-04 11:00', max_bars=100), 'raw')
+        bars = pyramid.load('2022-01-03', '2022-01-04 23:59', max_bars=50, columns=['Close'])
+        self.assertEqual(list(bars.columns), ['Close'])
+        self.assertEqual(len(bars), 14)
+
+    def test_pyramid_build_fails_without_manifest(self):
+        pyramid = OHLCVPyramid(self.directory.name)
+        with self.assertRaises(ValueError):
+            pyramid.build(self.data.assign(Ticker='AAA'))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'pyramid.json')))
+
+    def test_candlestick_from_pyramid(self):
+        pyramid = OHLCVPyramid(self.directory.name)
+        pyramid.build(self.data)
+        loads = []
+        load = pyramid.load
+        pyramid.load = lambda *args, **kwargs: loads.append(load(*args, **kwargs)) or loads[-1]
+        file_path = os.path.join(self.directory.name, 'candles.png')
+        DataVisualizer(max_bars=50).save_chart('candlestick', pyramid, 'AAA', file_path,
+                                               start='2022-01-03', end='2022-01-04 23:59')
+        self.assertTrue(os.path.exists(file_path))
+        self.assertEqual(len(loads[0]), 14)
+
+class TestTimeSeries(unittest.TestCase):
+
+    def setUp(self):
+        self.data = pd.DataFrame({
+            'Open': np.random.randn(100).cumsum() + 100,
+            'High': np.random.randn(100).cumsum() + 102,
+            'Low': np.random.randn(100).cumsum() + 98,
+            'Close': np.random.randn(100).cumsum() + 100,
+            'Volume': np.random.randint(1, 1000, size=100)
+        }, index=pd.date_range(start='2022-01-01', periods=100, freq='D', name='Date'))
+        self.market_data = pd.DataFrame({
+            'Close': np.random.randn(90).cumsum() + 100
+        }, index=pd.date_range(start='2022-01-11', periods=90, freq='D', name='Date'))
+
+    def test_sorts_and_deduplicates(self):
+        shuffled = pd.concat([self.data.iloc[::-1], self.data.iloc[:5] * 2]).reset_index()
+        series = TimeSeries(shuffled)
+        self.assertIsInstance(series.index, pd.DatetimeIndex)
+        self.assertTrue(series.index.is_monotonic_increasing and series.index.is_unique)
+        self.assertEqual(len(series), 100)
+        self.assertEqual(series['Close'].iloc[0], self.data['Close'].iloc[0] * 2)
+        self.assertIs(TimeSeries(self.data).to_frame(), self.data)
+
+    def test_slice(self):
+        series = TimeSeries(self.data)
+        sliced = series.slice('2022-02-01', '2022-02-28')
+        pd.testing.assert_frame_equal(sliced.to_frame(), self.data.loc['2022-02-01':'2022-02-28'])
+        self.assertTrue(np.shares_memory(sliced['Close'].to_numpy(), series['Close'].to_numpy()))
+        self.assertEqual(len(series['2022-03-01':]), len(self.data.loc['2022-03-01':]))
+
+    def test_asof_join(self):
+        hourly = TimeSeries(pd.DataFrame({'Close': np.arange(48.0)},
+                                         index=pd.date_range('2022-01-10', periods=48, freq='h')))
+        joined = hourly.asof_join(TimeSeries(self.market_data), tolerance='1D')
+        expected = pd.merge_asof(hourly.to_frame(), self.market_data.rename(columns={'Close': 'Close_other'}),
+                                 left_index=True, right_index=True, tolerance=pd.Timedelta('1D'))
+        pd.testing.assert_frame_equal(joined.to_frame(), expected, check_freq=False)
+        self.assertTrue(joined['Close_other'].iloc[:24].isna().all())
+
+    def test_analyzer_and_visualizer_accept_series(self):
+        data_analyzer = DataAnalyzer()
+        series, market = TimeSeries(self.data), TimeSeries(self.market_data)
+        self.assertAlmostEqual(data_analyzer.calculate_beta(series, market, 'Close'),
+                               data_analyzer.calculate_beta(self.data, self.market_data, 'Close'))
+        self.assertEqual(data_analyzer.compute_all(series, 'Close', market_data=market),
+                         data_analyzer.compute_all(self.data, 'Close', market_data=self.market_data))
+        data_visualizer = DataVisualizer()
+        try:
+            data_visualizer.plot_candlestick(series, 'AAPL')
+            data_visualizer.plot_macd(series, 'Close', 'AAPL')
+        except Exception as e:
+            self.fail(f"plotting a TimeSeries raised an exception: {e}")
+
+class TestCorrelationMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.prices = pd.DataFrame(100 * np.exp(np.random.normal(0, 0.01, (300, 5)).cumsum(axis=0)),
+                                   columns=['A', 'B', 'C', 'D', 'E'])
+        self.prices.iloc[:40, 1] = np.nan
+        self.prices.iloc[150:155, 3] = np.nan
+        self.returns = self.prices.pct_change(fill_method=None)
+
+    def test_fit_matches_pandas(self):
+        correlation_matrix = CorrelationMatrix(block_size=2).fit(self.prices)
+        pd.testing.assert_frame_equal(correlation_matrix.correlation(), self.returns.corr())
+        pd.testing.assert_frame_equal(correlation_matrix.covariance(), self.returns.cov())
+
+    def test_update_and_window(self):
+        correlation_matrix = CorrelationMatrix(block_size=3).fit(self.prices.iloc[:200])
+        for row in range(200, 300):
+            correlation_matrix.update(self.prices.iloc[row])
+        pd.testing.assert_frame_equal(correlation_matrix.correlation(), self.returns.corr())
+
+        rolling = CorrelationMatrix(window=60).fit(self.prices.iloc[:120])
+        for start in range(120, 300, 9):
+            rolling.update(self.prices.iloc[start:start + 9])
+        pd.testing.assert_frame_equal(rolling.correlation(), self.returns.iloc[-60:].corr())
+
+    def test_float32_blocks(self):
+        correlation_matrix = CorrelationMatrix(dtype=np.float32, block_size=2).fit(self.prices)
+        correlation = correlation_matrix.correlation()
+        self.assertTrue((correlation.dtypes == np.float32).all())
+        np.testing.assert_allclose(correlation, self.returns.corr(), atol=1e-5)
+        blocks = list(correlation_matrix.iter_blocks())
+        self.assertEqual(len(blocks), 9)
+        rows, columns, block = blocks[1]
+        self.assertEqual((rows, columns), (['A', 'B'], ['C', 'D']))
+        np.testing.assert_array_equal(block, correlation.loc[rows, columns])
+
 class TestDataVisualizer(unittest.TestCase):
 
     def setUp(self):
@@ -140,5 +825,296 @@ class TestDataVisualizer(unittest.TestCase):
         except Exception as e:
             self.fail(f"plot_macd raised an exception: {e}")
 
+    def test_plots_downsample_long_series(self):
+        data_visualizer = DataVisualizer(max_points=40, max_bars=20)
+        try:
+            data_visualizer.plot_price_series(self.data, 'Close', self.ticker)
+            data_visualizer.plot_volume(self.data, self.ticker)
+            data_visualizer.plot_candlestick(self.data, self.ticker)
+        except Exception as e:
+            self.fail(f"downsampled plotting raised an exception: {e}")
+
+    def test_downsamples_yfinance_columns(self):
+        # yf.download returns (field, ticker) columns.
+        data = self.data.set_axis(pd.MultiIndex.from_product([self.data.columns, [self.ticker]]), axis=1)
+        data_visualizer = DataVisualizer(max_points=40)
+        try:
+            data_visualizer.plot_price_series(data, 'Close', self.ticker)
+            data_visualizer.plot_volume(data, self.ticker)
+        except Exception as e:
+            self.fail(f"plotting yfinance columns raised an exception: {e}")
+
+class TestChartBook(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame({
+            'Open': np.random.randn(100).cumsum() + 100,
+            'High': np.random.randn(100).cumsum() + 102,
+            'Low': np.random.randn(100).cumsum() + 98,
+            'Close': np.random.randn(100).cumsum() + 100,
+            'Volume': np.random.randint(1, 1000, size=100)
+        }, index=pd.date_range(start='2022-01-01', periods=100, freq='D', name='Date'))
+        self.csv_path = os.path.join(self.directory.name, 'AAA.csv')
+        self.data.to_csv(self.csv_path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_save_chart_reuses_figure_without_pyplot(self):
+        import matplotlib.pyplot as plt
+        figures = plt.get_fignums()
+        data_visualizer = DataVisualizer()
+        png = os.path.join(self.directory.name, 'price.png')
+        svg = os.path.join(self.directory.name, 'macd.svg')
+        figure = data_visualizer.save_chart('price_series', self.data, 'AAA', png, column='Close')
+        self.assertIs(data_visualizer.save_chart('macd', self.data, 'AAA', svg, figure=figure), figure)
+        self.assertEqual(plt.get_fignums(), figures)
+        with open(png, 'rb') as file:
+            self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+        with open(svg) as file:
+            self.assertIn('<svg', file.read())
+
+    def test_export(self):
+        output_dir = os.path.join(self.directory.name, 'charts')
+        chart_book = ChartBook(output_dir, workers=2, chunk_size=1)
+        written = chart_book.export({'AAA': self.csv_path, 'BBB': self.data,
+                                     'BAD': os.path.join(self.directory.name, 'missing.csv')})
+        self.assertEqual(len(written), 2 * 7)
+        self.assertTrue(all(os.path.getsize(file_path) > 0 for file_path in written))
+        self.assertIn('AAA_candlestick.png', os.listdir(output_dir))
+        self.assertEqual(list(chart_book.failures), ['BAD'])
+        self.assertEqual(chart_book.throughput['tickers'].sum(), 3)
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_run(self):
+        results = Benchmark(sizes=[200], ticker_counts=[3], repeat=1).run()
+        names = [result['name'] for result in results['results']]
+        self.assertIn('DataLoader.load_csv[rows=200]', names)
+        self.assertIn('DataAnalyzer.calculate_alpha[rows=200]', names)
+        self.assertIn('IndicatorEngine.macd[rows=200]', names)
+        self.assertIn('BatchAnalyzer.analyze[tickers=3]', names)
+
+    def test_compare(self):
+        baseline = {'results': [{'name': 'case', 'seconds': 1.0, 'peak_bytes': 100}]}
+        current = {'results': [{'name': 'case', 'seconds': 1.5, 'peak_bytes': 100}]}
+        self.assertEqual([regression['metric'] for regression in compare(current, baseline, 0.2)], ['seconds'])
+        self.assertEqual(compare(current, baseline, 0.6), [])
+
+    def test_analysis_imports_skip_heavy_backends(self):
+        result = import_time(ENTRY_POINTS['analysis'])
+        self.assertEqual(result['heavy_modules'], [])
+        self.assertGreater(result['seconds'], 0)
+
+class FakeRoot:
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append(callback)
+
+class TestTaskScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.root = FakeRoot()
+        self.task_scheduler = TaskScheduler(self.root, workers=2)
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.task_scheduler.shutdown()
+
+    def wait_for_results(self):
+        while self.task_scheduler.pending():
+            self.release.set()
+            self.root.scheduled.pop(0)()
+            threading.Event().wait(0.01)
+
+    def test_results_delivered_on_poll(self):
+        results = []
+        self.task_scheduler.submit('mean', lambda: 42, results.append)
+        self.assertEqual(results, [])
+        self.wait_for_results()
+        self.assertEqual(results, [42])
+
+    def test_duplicate_requests_coalesced(self):
+        calls, results = [], []
+
+        def slow_beta():
+            calls.append(1)
+            self.release.wait()
+            return 1.2
+
+        self.assertTrue(self.task_scheduler.submit('beta', slow_beta, results.append))
+        self.assertFalse(self.task_scheduler.submit('beta', slow_beta, results.append))
+        self.wait_for_results()
+        self.assertEqual(calls, [1])
+        self.assertEqual(results, [1.2, 1.2])
+
+    def test_cancel(self):
+        results = []
+        self.task_scheduler.submit('load', lambda: self.release.wait(), results.append)
+        self.task_scheduler.cancel('load')
+        self.release.set()
+        self.task_scheduler.shutdown(wait=True)
+        self.task_scheduler.poll()
+        self.assertEqual(results, [])
+        self.assertEqual(self.task_scheduler.pending(), 0)
+
+    def test_shutdown_does_not_block_exit(self):
+        self.task_scheduler.submit('load', lambda: self.release.wait(), print)
+        self.task_scheduler.shutdown()
+        self.assertTrue(all(worker.daemon for worker in self.task_scheduler.workers))
+
+    def test_errors_reported(self):
+        errors = []
+        self.task_scheduler.submit('bad', lambda: 1 / 0, print, errors.append)
+        self.wait_for_results()
+        self.assertIsInstance(errors[0], ZeroDivisionError)
+
+class TestBatchApp(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        for ticker in ['AAA', 'MKT']:
+            data = pd.DataFrame({
+                'Date': pd.date_range(start='1/1/2022', periods=100, freq='D'),
+                'Close': np.random.randn(100).cumsum() + 100
+            })
+            data.to_csv(os.path.join(self.directory.name, f'{ticker}.csv'), index=False)
+        self.output = os.path.join(self.directory.name, 'report.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_run(self):
+        downloads = []
+        batch_app = BatchApp()
+        batch_app.data_loader.fetch = lambda ticker, start, end: downloads.append(ticker)
+        status = batch_app.run([], [os.path.join(self.directory.name, '*.csv')], '2022-01-10', None,
+                               ['mean', 'beta'], self.output, market='MKT')
+        self.assertEqual(status, 0)
+        self.assertEqual(downloads, [])
+        report = pd.read_csv(self.output)
+        self.assertEqual(list(report.columns), ['Ticker', 'mean', 'beta'])
+        self.assertEqual(list(report['Ticker']), ['AAA'])
+
+    def test_charts_reuse_loaded_frames(self):
+        downloads = []
+        batch_app = BatchApp()
+        batch_app.data_loader.fetch = lambda ticker, start, end: downloads.append(ticker)
+        charts = os.path.join(self.directory.name, 'charts')
+        batch_app.run([], [os.path.join(self.directory.name, '*.csv')], '2022-03-01', None, ['mean'], self.output,
+                      charts=charts)
+        self.assertEqual(downloads, [])
+        self.assertEqual(batch_app.frames['AAA'].index[0], pd.Timestamp('2022-03-01'))
+        self.assertTrue(os.path.exists(os.path.join(charts, 'AAA_price_series.png')))
+
+    def test_headless_path_skips_gui_imports(self):
+        script = ("import sys, app2; app2.main(sys.argv[1:]); "
+                  "print('tkinter' in sys.modules or 'matplotlib' in sys.modules)")
+        result = subprocess.run([sys.executable, '-c', script, '--csv', os.path.join(self.directory.name, '*.csv'),
+                                 '--output', self.output], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip().splitlines()[-1], 'False')
+
+class TestRollingAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        self.rolling_analyzer = RollingAnalyzer(windows=(20, 50))
+        self.data = pd.DataFrame({
+            'Close': np.random.randn(200).cumsum() + 200
+        })
+        self.market_data = pd.DataFrame({
+            'Close': np.random.randn(200).cumsum() + 200
+        })
+
+    def test_rolling_metrics(self):
+        results = self.rolling_analyzer.rolling_metrics(self.data, 'Close', self.market_data, risk_free_rate=0.02)
+        daily_return = self.data['Close'].pct_change()
+        market_return = self.market_data['Close'].pct_change()
+        excess_return = daily_return - 0.02 / 252
+        for window in (20, 50):
+            np.testing.assert_allclose(results['volatility'][window], daily_return.rolling(window).std() * np.sqrt(252))
+            np.testing.assert_allclose(results['sharpe_ratio'][window],
+                                       excess_return.rolling(window).mean() / excess_return.rolling(window).std() * np.sqrt(252))
+            np.testing.assert_allclose(results['beta'][window],
+                                       daily_return.rolling(window).cov(market_return) / market_return.rolling(window).var(ddof=0))
+
+    def test_matches_whole_period_methods(self):
+        results = self.rolling_analyzer.rolling_metrics(self.data, 'Close', self.market_data)
+        tail, market_tail = self.data.iloc[-51:], self.market_data.iloc[-51:]
+        data_analyzer = DataAnalyzer()
+        self.assertAlmostEqual(results['sharpe_ratio'][50].iloc[-1], data_analyzer.calculate_sharpe_ratio(tail, 'Close'))
+        self.assertAlmostEqual(results['beta'][50].iloc[-1], data_analyzer.calculate_beta(tail, market_tail, 'Close'))
+
+class TestMarketBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        dates = pd.date_range(start='2022-01-01', periods=100, freq='D')
+        self.market_data = pd.DataFrame({'Close': np.random.randn(100).cumsum() + 100}, index=dates)
+        self.prices = pd.DataFrame({
+            'AAA': np.random.randn(100).cumsum() + 100,
+            'BBB': np.random.randn(100).cumsum() + 100
+        }, index=dates)
+        self.market_benchmark = MarketBenchmark(self.market_data)
+        self.data_analyzer = DataAnalyzer()
+
+    def test_matches_data_analyzer(self):
+        stock_data = self.prices[['AAA']].rename(columns={'AAA': 'Close'}).iloc[10:90]
+        self.assertAlmostEqual(self.market_benchmark.beta(stock_data),
+                               self.data_analyzer.calculate_beta(stock_data, self.market_data, 'Close'))
+        self.assertAlmostEqual(self.market_benchmark.alpha(stock_data),
+                               self.data_analyzer.calculate_alpha(stock_data, self.market_data, 'Close'))
+        self.assertAlmostEqual(self.data_analyzer.calculate_beta(stock_data, self.market_benchmark, 'Close'),
+                               self.data_analyzer.calculate_beta(stock_data, self.market_data, 'Close'))
+
+    def test_correlation_and_tracking_error(self):
+        stock_data = self.prices[['AAA']].rename(columns={'AAA': 'Close'})
+        stock_return = stock_data['Close'].pct_change()
+        market_return = self.market_data['Close'].pct_change()
+        self.assertAlmostEqual(self.market_benchmark.correlation(stock_data), stock_return.corr(market_return))
+        self.assertAlmostEqual(self.market_benchmark.tracking_error(stock_data),
+                               (stock_return - market_return).std() * np.sqrt(252))
+
+    def test_analyze(self):
+        results = self.market_benchmark.analyze(self.prices)
+        self.assertEqual(list(results.columns), ['beta', 'alpha', 'correlation', 'tracking_error'])
+        stock_data = self.prices[['BBB']].rename(columns={'BBB': 'Close'})
+        self.assertAlmostEqual(results.loc['BBB', 'beta'], self.market_benchmark.beta(stock_data))
+
+class TestDownsampler(unittest.TestCase):
+
+    def setUp(self):
+        self.downsampler = Downsampler()
+        self.values = np.random.randn(10_001).cumsum()
+
+    def test_minmax_indices_keep_extremes(self):
+        indices = self.downsampler.minmax_indices(self.values, 100)
+        self.assertLessEqual(len(indices), 202)
+        self.assertIn(np.argmin(self.values), indices)
+        self.assertIn(np.argmax(self.values), indices)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_lttb_indices(self):
+        indices = self.downsampler.lttb_indices(np.arange(len(self.values)), self.values, 500)
+        self.assertEqual(len(indices), 500)
+        self.assertEqual((indices[0], indices[-1]), (0, len(self.values) - 1))
+        self.assertTrue(np.all(np.diff(indices) > 0))
+
+    def test_resample_ohlc(self):
+        data = pd.DataFrame({
+            'Open': np.arange(10.0), 'High': np.arange(10.0) + 1, 'Low': np.arange(10.0) - 1,
+            'Close': np.arange(10.0) + 0.5, 'Volume': np.ones(10, dtype=int)
+        }, index=pd.date_range('2022-01-01', periods=10, freq='min'))
+        bars = self.downsampler.resample_ohlc(data, 4)
+        self.assertEqual(list(bars['Open']), [0.0, 3.0, 6.0, 9.0])
+        self.assertEqual(list(bars['High']), [3.0, 6.0, 9.0, 10.0])
+        self.assertEqual(list(bars['Low']), [-1.0, 2.0, 5.0, 8.0])
+        self.assertEqual(list(bars['Close']), [2.5, 5.5, 8.5, 9.5])
+        self.assertEqual(list(bars['Volume']), [3, 3, 3, 1])
+        self.assertEqual(bars.index[1], data.index[3])
+
 if __name__ == '__main__':
     unittest.main()
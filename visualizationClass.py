@@ -1,81 +1,166 @@
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
-import mplfinance as mpf
+from indicatorClass import IndicatorEngine
+from downsamplingClass import Downsampler
+from resamplingClass import OHLCVPyramid
+from statisticalAnalysisClass import column_prices
+from timeSeriesClass import TimeSeries
+
+CHARTS = ('price_series', 'moving_average', 'volume', 'rsi', 'candlestick', 'bollinger_bands', 'macd')
+WIDE_CHARTS = ('bollinger_bands', 'macd')
 
 class DataVisualizer:
+    def __init__(self, indicator_engine: IndicatorEngine = None, max_points: int = 4000, max_bars: int = 500):
+        self.indicator_engine = indicator_engine or IndicatorEngine()
+        self.downsampler = Downsampler()
+        self.max_points = max_points
+        self.max_bars = max_bars
+
     def plot_price_series(self, data: pd.DataFrame, column: str, ticker: str):
-        plt.plot(data.index, data[column])
-        plt.title(f'Price Series of {ticker} ({column})')
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.show()
+        self._show('price_series', data, ticker=ticker, column=column)
 
     def plot_moving_average(self, data: pd.DataFrame, column: str, window: int, ticker: str):
-        data['Moving Average'] = data[column].rolling(window=window).mean()
-        plt.plot(data.index, data[column], label=column)
-        plt.plot(data.index, data['Moving Average'], label=f'{window}-Day Moving Average')
-        plt.title(f'{window}-Day Moving Average of {ticker} ({column})')
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        plt.show()
+        self._show('moving_average', data, ticker=ticker, column=column, window=window)
 
     def plot_volume(self, data: pd.DataFrame, ticker: str):
-        plt.bar(data.index, data['Volume'])
-        plt.title(f'Volume over Time for {ticker}')
-        plt.xlabel('Date')
-        plt.ylabel('Volume')
-        plt.show()
+        self._show('volume', data, ticker=ticker)
 
     def plot_rsi(self, data: pd.DataFrame, ticker: str, column='Close', window=14):
-        delta = data[column].diff(1)
-        gain = delta.mask(delta < 0, 0)
-        loss = -delta.mask(delta > 0, 0)
-        avg_gain = gain.rolling(window=window).mean()
-        avg_loss = loss.rolling(window=window).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        plt.plot(data.index, rsi)
-        plt.axhline(30, linestyle='--', alpha=0.5, color='red')
-        plt.axhline(70, linestyle='--', alpha=0.5, color='red')
-        plt.title(f'Relative Strength Index (RSI) for {ticker}')
-        plt.xlabel('Date')
-        plt.ylabel('RSI')
-        plt.show()
+        self._show('rsi', data, ticker=ticker, column=column, window=window)
 
-    def plot_candlestick(self, data: pd.DataFrame, ticker: str):
-        mpf.plot(data, type='candle', style='charles', volume=True, title=f'Candlestick Chart for {ticker}', show_nontrading=True)
+    def plot_candlestick(self, data: pd.DataFrame, ticker: str, start=None, end=None):
+        self._show('candlestick', data, ticker=ticker, start=start, end=end)
 
     def plot_bollinger_bands(self, data: pd.DataFrame, column: str, ticker: str, window: int=20):
-        data['SMA'] = data[column].rolling(window=window).mean()
-        data['STD'] = data[column].rolling(window=window).std()
-        data['Upper Band'] = data['SMA'] + (data['STD'] * 2)
-        data['Lower Band'] = data['SMA'] - (data['STD'] * 2)
-        
-        plt.figure(figsize=(12,6))
-        plt.plot(data[column], label=column)
-        plt.plot(data['SMA'], label='SMA')
-        plt.plot(data['Upper Band'], label='Upper Band')
-        plt.plot(data['Lower Band'], label='Lower Band')
-        plt.fill_between(data.index, data['Lower Band'], data['Upper Band'], color='gray', alpha=0.1)
-        plt.title(f'Bollinger Bands for {ticker}')
-        plt.xlabel('Date')
-        plt.ylabel('Price')
-        plt.legend()
-        plt.show()
+        self._show('bollinger_bands', data, ticker=ticker, column=column, window=window)
 
     def plot_macd(self, data: pd.DataFrame, column: str, ticker: str, short_window: int=12, long_window: int=26, signal_window: int=9):
-        data['Short EMA'] = data[column].ewm(span=short_window, adjust=False).mean()
-        data['Long EMA'] = data[column].ewm(span=long_window, adjust=False).mean()
-        data['MACD'] = data['Short EMA'] - data['Long EMA']
-        data['Signal Line'] = data['MACD'].ewm(span=signal_window, adjust=False).mean()
-
-        plt.figure(figsize=(12,6))
-        plt.plot(data['MACD'], label='MACD', color = 'blue')
-        plt.plot(data['Signal Line'], label='Signal Line', color='red')
-        plt.title(f'MACD for {ticker}')
-        plt.xlabel('Date')
-        plt.ylabel('MACD')
-        plt.legend()
+        self._show('macd', data, ticker=ticker, column=column, short_window=short_window,
+                   long_window=long_window, signal_window=signal_window)
+
+    def save_chart(self, chart: str, data: pd.DataFrame, ticker: str, file_path: str, figure=None, dpi: int = 100,
+                   **kwargs):
+        # Renders without pyplot, so nothing is registered globally and the
+        # caller can pass the same Figure back in for the next chart.
+        from matplotlib.figure import Figure
+        figure = figure or Figure()
+        figure.clear()
+        figure.set_size_inches((12, 6) if chart in WIDE_CHARTS else (8, 6))
+        self.draw(chart, figure, data, ticker, **kwargs)
+        figure.savefig(file_path, dpi=dpi)
+        return figure
+
+    def draw(self, chart: str, figure, data: pd.DataFrame, ticker: str, start=None, end=None, **kwargs):
+        if chart not in CHARTS:
+            raise ValueError(f"Unknown chart: {chart}")
+        if isinstance(data, OHLCVPyramid):
+            # Read the finest stored level that still fits on screen instead
+            # of rescanning the raw bars.
+            data = data.load(start, end, max_bars=self.max_bars if chart == 'candlestick' else self.max_points)
+        elif start is not None or end is not None:
+            data = TimeSeries(data).slice(start, end)
+        if isinstance(data, TimeSeries):
+            data = data.to_frame()
+        getattr(self, f'_draw_{chart}')(figure, data, ticker, **kwargs)
+
+    def _show(self, chart, data, ticker, **kwargs):
+        import matplotlib.pyplot as plt
+        figure = plt.figure(figsize=(12, 6)) if chart in WIDE_CHARTS else plt.figure()
+        self.draw(chart, figure, data, ticker, **kwargs)
         plt.show()
-        
+
+    def _draw_price_series(self, figure, data, ticker, column='Close'):
+        ax = figure.gca()
+        self._plot_downsampled(ax, data.index, column_prices(data, column))
+        ax.set_title(f'Price Series of {ticker} ({column})')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Price')
+
+    def _draw_moving_average(self, figure, data, ticker, column='Close', window=20):
+        ax = figure.gca()
+        moving_average = self.indicator_engine.sma(data[column], window)
+        ax.plot(data.index, data[column], label=column)
+        ax.plot(data.index, moving_average, label=f'{window}-Day Moving Average')
+        ax.set_title(f'{window}-Day Moving Average of {ticker} ({column})')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Price')
+        ax.legend()
+
+    def _draw_volume(self, figure, data, ticker):
+        ax = figure.gca()
+        volume = column_prices(data, 'Volume')
+        if len(volume) > self.max_points:
+            # One bar per pixel column at the bucket's peak; a Bar artist per
+            # raw row is what made minute data take minutes to draw.
+            starts = np.arange(0, len(volume), -(-len(volume) // self.max_points))
+            ax.vlines(data.index[starts], 0, np.maximum.reduceat(volume, starts))
+        else:
+            ax.bar(data.index, volume)
+        ax.set_title(f'Volume over Time for {ticker}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Volume')
+
+    def _draw_rsi(self, figure, data, ticker, column='Close', window=14):
+        ax = figure.gca()
+        rsi = self.indicator_engine.rsi(data[column], window)
+        ax.plot(data.index, rsi)
+        ax.axhline(30, linestyle='--', alpha=0.5, color='red')
+        ax.axhline(70, linestyle='--', alpha=0.5, color='red')
+        ax.set_title(f'Relative Strength Index (RSI) for {ticker}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('RSI')
+
+    def _draw_candlestick(self, figure, data, ticker):
+        import mplfinance as mpf
+        data = self.downsampler.resample_ohlc(data, self.max_bars)
+        # External axes mode: mplfinance draws into our figure instead of
+        # creating (and showing) one of its own.
+        ax, volume_ax = figure.subplots(2, 1, sharex=True, gridspec_kw={'height_ratios': [3, 1]})
+        mpf.plot(data, type='candle', style='charles', ax=ax, volume=volume_ax, show_nontrading=True)
+        ax.set_title(f'Candlestick Chart for {ticker}')
+
+    def _draw_bollinger_bands(self, figure, data, ticker, column='Close', window=20):
+        ax = figure.gca()
+        sma, upper_band, lower_band = self.indicator_engine.bollinger_bands(data[column], window)
+        ax.plot(data.index, data[column], label=column)
+        ax.plot(data.index, sma, label='SMA')
+        ax.plot(data.index, upper_band, label='Upper Band')
+        ax.plot(data.index, lower_band, label='Lower Band')
+        ax.fill_between(data.index, lower_band, upper_band, color='gray', alpha=0.1)
+        ax.set_title(f'Bollinger Bands for {ticker}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('Price')
+        ax.legend()
+
+    def _draw_macd(self, figure, data, ticker, column='Close', short_window=12, long_window=26, signal_window=9):
+        ax = figure.gca()
+        macd, signal_line = self.indicator_engine.macd(data[column], short_window, long_window, signal_window)
+        ax.plot(data.index, macd, label='MACD', color = 'blue')
+        ax.plot(data.index, signal_line, label='Signal Line', color='red')
+        ax.set_title(f'MACD for {ticker}')
+        ax.set_xlabel('Date')
+        ax.set_ylabel('MACD')
+        ax.legend()
+
+    def _plot_downsampled(self, ax, index, values, **kwargs):
+        import matplotlib.dates as mdates
+        y = np.asarray(values, dtype=np.float64)
+        buckets = self.max_points // 2
+        indices = self.downsampler.minmax_indices(y, buckets)
+        line, = ax.plot(index[indices], y[indices], **kwargs)
+        if len(indices) == len(y):
+            return line
+
+        x = mdates.date2num(index) if isinstance(index, pd.DatetimeIndex) else np.asarray(index, dtype=np.float64)
+
+        def refine(ax):
+            # Re-pick the envelope from the raw points inside the new view,
+            # so zooming in reveals detail the first pass dropped.
+            low, high = ax.get_xlim()
+            start = max(int(np.searchsorted(x, low)) - 1, 0)
+            stop = min(int(np.searchsorted(x, high, side='right')) + 1, len(x))
+            visible = start + self.downsampler.minmax_indices(y[start:stop], buckets)
+            line.set_data(x[visible], y[visible])
+
+        ax.callbacks.connect('xlim_changed', refine)
+        return line